@@ -8,7 +8,7 @@ from pathlib import Path
 from .core.config import config
 from .main_loop import main as _async_main
 from .main_interactive import run_interactive
-from .tools.content_access import set_large_content
+from .tools.content_access import get_large_line_count, set_large_content
 
 _CONFIG_PATH = Path.home() / ".config" / "germinal" / "config.yaml"
 
@@ -157,8 +157,7 @@ def main() -> None:
                 set_large_content(stdin_content)
 
                 # Create a summary prompt that tells the agent about the large content
-                lines = stdin_content.splitlines()
-                total_lines = len(lines)
+                total_lines = get_large_line_count()
                 total_chars = len(stdin_content)
 
                 content_summary = (
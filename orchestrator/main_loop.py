@@ -44,6 +44,7 @@ from .tools.content_access import (
 from .tools.filesystem import (
     make_list_directory_tool,
     make_read_file_tool,
+    make_read_files_tool,
     make_write_file_tool,
 )
 from .tools.code_quality import make_check_syntax_tool, make_lint_tool
@@ -96,6 +97,7 @@ def build_full_registry(config: dict, db_path: str) -> ToolRegistry:
 
     registry = ToolRegistry()
     registry.register(make_read_file_tool(allowed_read))
+    registry.register(make_read_files_tool(allowed_read))
     registry.register(make_write_file_tool(allowed_write))
     registry.register(make_list_directory_tool(allowed_read))
     registry.register(make_notify_user_tool())
@@ -230,7 +232,13 @@ async def _event_loop(
         if event is None:
             # Yield to the asyncio event loop so the network adapter can
             # accept and service connections while the queue is empty.
-            await asyncio.sleep(_IDLE_SLEEP_SECONDS)
+            # Waiting on stop_event rather than sleeping lets a shutdown
+            # end the idle wait at once instead of up to a full interval
+            # later (every test fixture tearing this loop down pays that).
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=_IDLE_SLEEP_SECONDS)
+            except asyncio.TimeoutError:
+                pass
             continue
 
         event_id = event["id"]
@@ -1,19 +1,62 @@
-# Purpose: Code quality tools: lint (ruff) and check_syntax (py_compile).
+# Purpose: Code quality tools: lint (ruff) and check_syntax (compile()).
 # Relationships: Registered into tools/registry.py via make_* factories;
 #               called by dev_agent through core/agent_invoker.py.
 
-# All tools use subprocess.run(..., shell=False). Neither tool modifies files
-# unless fix=True is passed to lint. check_syntax is read-only by design.
+# lint uses subprocess.run(..., shell=False) via _run_captured(); check_syntax
+# compiles in a long-lived worker process (_CompileWorker). Neither tool
+# modifies files unless fix=True is passed to lint. check_syntax is read-only
+# by design: it never writes .pyc files.
 
+import atexit
+import copy
+import json
+import os
+import select
+import stat
 import subprocess
 import sys
+import tempfile
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from .registry import Tool, model_to_json_schema
 
 _LINT_TIMEOUT = 60   # seconds; linting a large codebase should not exceed this
-_SYNTAX_TIMEOUT = 30  # seconds; py_compile on a single file is always fast
+_SYNTAX_TIMEOUT = 30  # seconds; compiling a single file is always fast
+
+# Maximum number of single-file lint results remembered per lint tool.
+_LINT_CACHE_MAX_ENTRIES = 256
+
+# Linter configuration files. A remembered lint result is only reused while
+# every one of these, in the file's directory, its ancestors and the working
+# directory (where flake8 looks), is unchanged.
+_LINT_CONFIG_FILES = ("pyproject.toml", "ruff.toml", ".ruff.toml", ".flake8", "setup.cfg", "tox.ini")
+
+
+def _run_captured(cmd: list[str], timeout: int) -> tuple[int, str, str]:
+    """
+    Run cmd (shell=False) and return (returncode, stdout, stderr).
+
+    Raises the same exceptions as subprocess.run (FileNotFoundError,
+    TimeoutExpired); callers map them to error dicts.
+
+    # Output is sent to anonymous temp files rather than pipes. With
+    # capture_output the parent drains both pipes in a Python loop and
+    # decodes chunk by chunk; here the child writes straight into the page
+    # cache and we decode each stream once at the end. Directory-wide lint
+    # output can run to hundreds of KB.
+    # TemporaryFile rather than SpooledTemporaryFile: subprocess needs a real
+    # fileno(), which makes a spooled file roll over to disk immediately.
+    """
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        proc = subprocess.run(cmd, stdout=out, stderr=err, timeout=timeout, shell=False)
+        out.seek(0)
+        err.seek(0)
+        return (
+            proc.returncode,
+            out.read().decode("utf-8", "replace"),
+            err.read().decode("utf-8", "replace"),
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -30,71 +73,66 @@ class LintParams(BaseModel):
     )
 
 
+_LINT_SCHEMA = model_to_json_schema(LintParams)
+
+
 class LintResult(BaseModel):
-    stdout: str = Field(description="Standard output from the linter.")
+    stdout: str = Field(
+        description=(
+            "Standard output from the linter. Empty when ruff's JSON report "
+            "was parsed into diagnostics."
+        ),
+    )
     stderr: str = Field(description="Standard error from the linter.")
     returncode: int = Field(description="Return code from the linter.")
     passed: bool = Field(description="True if the linter reported no issues (returncode 0).")
     tool_used: str = Field(description="The linter tool that was used ('ruff' or 'flake8').")
+    diagnostics: list[dict] = Field(
+        default_factory=list,
+        description=(
+            "Structured ruff findings, one per issue, with code, message, "
+            "filename, row, column and fixable. Empty for flake8."
+        ),
+    )
 
 
 def make_lint_tool() -> Tool:
     """
     Return a lint tool that runs ruff.
 
+    # Dev agents re-lint the same file many times while iterating on other
+    # files, and each call forks a cold linter process. Results for a single
+    # file are therefore remembered under its real path, stamped with the
+    # inode, ctime, mtime and size of the file and of the linter configs
+    # that apply to it, and returned without spawning anything while none of
+    # them changes.
+    # Only read-only runs (fix=False) on regular files are cached: a --fix
+    # run changes the file, and a directory cannot be checked for changes
+    # cheaply. Entries are deep-copied in and out so a caller editing the
+    # diagnostics cannot change what the next caller gets. The cache lives
+    # only as long as this tool instance.
+    # A persistent `ruff server` (LSP) was considered and rejected: it needs
+    # a JSON-RPC client, cannot apply --fix, and has no flake8 fallback.
     """
+    cache: dict[str, tuple[tuple, dict]] = {}
 
     def execute(params: dict) -> dict:
         path = params["path"]
         fix = params.get("fix", False)
 
-        # Try ruff first.
-        ruff_cmd = ["ruff", "check", path]
-        if fix:
-            ruff_cmd.append("--fix")
-        try:
-            proc = subprocess.run(
-                ruff_cmd,
-                capture_output=True,
-                text=True,
-                timeout=_LINT_TIMEOUT,
-                shell=False,
-            )
-            return LintResult(
-                stdout=proc.stdout,
-                stderr=proc.stderr,
-                returncode=proc.returncode,
-                passed=proc.returncode == 0,
-                tool_used="ruff",
-            ).model_dump()
-        except FileNotFoundError:
-            # Try flake8 as fallback
-            flake8_cmd = ["flake8", path]
-            try:
-                proc = subprocess.run(
-                    flake8_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=_LINT_TIMEOUT,
-                    shell=False,
-                )
-                return LintResult(
-                    stdout=proc.stdout,
-                    stderr=proc.stderr,
-                    returncode=proc.returncode,
-                    passed=proc.returncode == 0,
-                    tool_used="flake8",
-                ).model_dump()
-            except FileNotFoundError:
-                return {"error": "Neither ruff nor flake8 found in PATH"}
-            except subprocess.TimeoutExpired:
-                return {"error": f"Linter timed out after {_LINT_TIMEOUT}s"}
-            except Exception as exc:
-                return {"error": str(exc)}
-        except subprocess.TimeoutExpired:
-            return {"error": f"Linter timed out after {_LINT_TIMEOUT}s"}
-        except Exception as exc:
-            return {"error": str(exc)}
+        key = os.path.realpath(path)
+        stamp = None if fix else _lint_stamp(key)
+        if stamp is not None:
+            cached = cache.get(key)
+            if cached is not None and cached[0] == stamp:
+                return copy.deepcopy(cached[1])
+
+        result = _run_linter(path, fix)
+        if stamp is not None and "error" not in result:
+            if len(cache) >= _LINT_CACHE_MAX_ENTRIES:
+                cache.clear()
+            cache[key] = (stamp, copy.deepcopy(result))
+        return result
 
     return Tool(
         name="lint",
@@ -103,13 +141,126 @@ def make_lint_tool() -> Tool:
             "Set fix=true to auto-fix safe issues with ruff. "
             "Returns passed=true if no issues were found."
         ),
-        parameters_schema=model_to_json_schema(LintParams),
+        parameters_schema=_LINT_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=LintParams,
     )
 
 
+def _file_stamp(path: str) -> tuple[int, int, int, int] | None:
+    """
+    Return (ino, ctime_ns, mtime_ns, size) for a regular file, or None if
+    path is anything else.
+
+    # File timestamps come from a coarse clock, so two same-size writes can
+    # share an mtime; ctime also catches an mtime set back with utime(), and
+    # the inode catches a file replaced by rename.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return (st.st_ino, st.st_ctime_ns, st.st_mtime_ns, st.st_size)
+
+
+def _lint_stamp(real_path: str) -> tuple | None:
+    """
+    Return a stamp of a regular file and the linter configs around it, or None.
+
+    real_path must already be resolved with os.path.realpath().
+    """
+    file_stamp = _file_stamp(real_path)
+    if file_stamp is None:
+        return None
+    # ruff uses the closest config above the file; flake8 reads the working
+    # directory's. Missing configs stamp as None, so creating one counts too.
+    directories = [os.getcwd()]
+    directory = os.path.dirname(real_path)
+    while True:
+        directories.append(directory)
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    configs = tuple(
+        _file_stamp(os.path.join(directory, name))
+        for directory in directories
+        for name in _LINT_CONFIG_FILES
+    )
+    return (file_stamp, configs)
+
+
+def _run_linter(path: str, fix: bool) -> dict:
+    """Run ruff on path, falling back to flake8 if ruff is not installed."""
+    # JSON output lets callers use findings without scraping ruff's text.
+    ruff_cmd = ["ruff", "check", "--output-format=json", path]
+    if fix:
+        ruff_cmd.append("--fix")
+    # Linters in order of preference. FileNotFoundError (executable not on
+    # PATH) moves on to the next one; any other failure is reported as-is.
+    linters = (("ruff", ruff_cmd), ("flake8", ["flake8", path]))
+
+    for tool_used, cmd in linters:
+        try:
+            returncode, stdout, stderr = _run_captured(cmd, _LINT_TIMEOUT)
+        except FileNotFoundError:
+            continue
+        except subprocess.TimeoutExpired:
+            return {"error": f"Linter timed out after {_LINT_TIMEOUT}s"}
+        except Exception as exc:
+            return {"error": str(exc)}
+        diagnostics: list[dict] = []
+        if tool_used == "ruff":
+            parsed = _parse_ruff_json(stdout)
+            if parsed is not None:
+                stdout, diagnostics = "", parsed
+        return {
+            "stdout": stdout,
+            "stderr": stderr,
+            "returncode": returncode,
+            "passed": returncode == 0,
+            "tool_used": tool_used,
+            "diagnostics": diagnostics,
+        }
+
+    return {"error": "Neither ruff nor flake8 found in PATH"}
+
+
+def _parse_ruff_json(stdout: str) -> list[dict] | None:
+    """
+    Convert ruff's --output-format=json report into compact diagnostics.
+
+    Returns None when stdout is not a JSON list (e.g. ruff printed an error
+    instead of a report); the caller then passes stdout through unchanged.
+
+    # Only the fields an agent needs to act on are kept. Ruff's full record
+    # also carries end locations, fix edits and a docs URL per finding,
+    # which roughly triples the tokens the result costs in the next prompt.
+    """
+    if not stdout.strip():
+        return []
+    try:
+        report = json.loads(stdout)
+    except ValueError:
+        return None
+    if not isinstance(report, list):
+        return None
+    return [
+        {
+            "code": item.get("code"),
+            "message": item.get("message"),
+            "filename": item.get("filename"),
+            "row": (item.get("location") or {}).get("row"),
+            "column": (item.get("location") or {}).get("column"),
+            "fixable": item.get("fix") is not None,
+        }
+        for item in report
+    ]
+
+
 # ---------------------------------------------------------------------------
 # check_syntax
 # ---------------------------------------------------------------------------
@@ -120,53 +271,143 @@ class CheckSyntaxParams(BaseModel):
     path: str = Field(description="Python file to syntax-check.")
 
 
+_CHECK_SYNTAX_SCHEMA = model_to_json_schema(CheckSyntaxParams)
+
+
 class CheckSyntaxResult(BaseModel):
-    stdout: str = Field(description="Standard output from py_compile (usually empty).")
-    stderr: str = Field(description="Standard error from py_compile (contains syntax errors).")
-    returncode: int = Field(description="Return code from py_compile.")
+    stdout: str = Field(description="Standard output from the check (usually empty).")
+    stderr: str = Field(description="Standard error from the check (contains syntax errors).")
+    returncode: int = Field(description="Return code: 0 if the file compiled, 1 otherwise.")
     valid: bool = Field(description="True if the file has no syntax errors (returncode 0).")
     path: str = Field(description="The file that was checked.")
 
 
+# Source of the check_syntax worker, run as `python -I -c _COMPILE_WORKER_SOURCE`.
+# Protocol: one JSON-encoded path per line on stdin, one JSON
+# [returncode, stdout, stderr] reply per line on stdout. Mirrors
+# `python -m py_compile <path>`: 0 and empty output for a valid file, 1 and
+# the formatted error otherwise. Source is compiled from bytes so PEP 263
+# coding cookies are honoured; compile() never runs the code or writes a .pyc.
+_COMPILE_WORKER_SOURCE = """\
+import json, sys, traceback
+for line in sys.stdin:
+    path = json.loads(line)
+    try:
+        with open(path, "rb") as f:
+            source = f.read()
+        compile(source, path, "exec", dont_inherit=True)
+        reply = [0, "", ""]
+    except (SyntaxError, ValueError) as exc:
+        reply = [1, "", "".join(traceback.format_exception_only(type(exc), exc))]
+    except OSError as exc:
+        reply = [1, "", str(exc) + "\\n"]
+    sys.stdout.write(json.dumps(reply) + "\\n")
+    sys.stdout.flush()
+"""
+
+
+class _CompileWorker:
+    """
+    A persistent Python process that syntax-checks files for check_syntax.
+
+    # Each `python -m py_compile` call paid interpreter start-up (tens of ms)
+    # for a sub-millisecond compile(). The worker is started once, on first
+    # use, and reused for every call; a call then costs one pipe round-trip.
+    # Compiling stays out of process so pathological input (deeply nested
+    # expressions that overflow the C stack) kills the worker, not the
+    # orchestrator. A dead or timed-out worker is discarded and restarted on
+    # the next call.
+    # A plain Popen rather than multiprocessing: forkserver/spawn children
+    # re-import the parent's __main__ (the whole orchestrator), and fork would
+    # duplicate the event loop and SQLite connections. -I keeps the worker
+    # isolated from PYTHON* env vars, user site-packages and the cwd.
+    """
+
+    def __init__(self) -> None:
+        self._proc: subprocess.Popen | None = None
+
+    def _start(self) -> None:
+        self._proc = subprocess.Popen(
+            [sys.executable, "-I", "-c", _COMPILE_WORKER_SOURCE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            shell=False,
+        )
+
+    def stop(self) -> None:
+        """Terminate the worker if it is running. Safe to call repeatedly."""
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc.stdin.close()
+            self._proc.stdout.close()
+            self._proc = None
+
+    def check(self, path: str, timeout: float) -> tuple[int, str, str]:
+        """
+        Return (returncode, stdout, stderr) for compiling path.
+
+        Raises TimeoutError if no reply arrives within timeout seconds.
+        """
+        if self._proc is None or self._proc.poll() is not None:
+            self.stop()
+            self._start()
+        try:
+            self._proc.stdin.write(json.dumps(path) + "\n")
+            self._proc.stdin.flush()
+            ready, _, _ = select.select([self._proc.stdout], [], [], timeout)
+            line = self._proc.stdout.readline() if ready else None
+        except (BrokenPipeError, ConnectionResetError):
+            line = ""
+        if line is None:
+            self.stop()
+            raise TimeoutError
+        if not line:
+            # The worker died mid-call (e.g. the compiler crashed on the file).
+            self.stop()
+            return 1, "", f"Syntax check worker exited while compiling {path}\n"
+        returncode, stdout, stderr = json.loads(line)
+        return returncode, stdout, stderr
+
+
 def make_check_syntax_tool() -> Tool:
     """
-    Return a check_syntax tool that validates Python syntax via py_compile.
+    Return a check_syntax tool that validates Python syntax like py_compile.
 
-    # Uses sys.executable so the same interpreter that runs the orchestrator
-    # is used for the check. This ensures the Python version matches.
+    # The worker runs sys.executable, so the Python version used for the
+    # check matches the one that runs the orchestrator.
     # Faster than run_tests — use this as a first check after writing a file.
     """
+    worker = _CompileWorker()
+    atexit.register(worker.stop)
 
     def execute(params: dict) -> dict:
         path = params["path"]
         try:
-            proc = subprocess.run(
-                [sys.executable, "-m", "py_compile", path],
-                capture_output=True,
-                text=True,
-                timeout=_SYNTAX_TIMEOUT,
-                shell=False,
-            )
-            return CheckSyntaxResult(
-                stdout=proc.stdout,
-                stderr=proc.stderr,
-                returncode=proc.returncode,
-                valid=proc.returncode == 0,
-                path=path,
-            ).model_dump()
-        except subprocess.TimeoutExpired:
-            return {"error": f"py_compile timed out after {_SYNTAX_TIMEOUT}s", "valid": False, "path": path}
+            returncode, stdout, stderr = worker.check(path, _SYNTAX_TIMEOUT)
+            return {
+                "stdout": stdout,
+                "stderr": stderr,
+                "returncode": returncode,
+                "valid": returncode == 0,
+                "path": path,
+            }
+        except TimeoutError:
+            return {"error": f"Syntax check timed out after {_SYNTAX_TIMEOUT}s", "valid": False, "path": path}
         except Exception as exc:
             return {"error": str(exc), "valid": False, "path": path}
 
     return Tool(
         name="check_syntax",
         description=(
-            "Check a Python file for syntax errors using py_compile. "
+            "Check a Python file for syntax errors by compiling it (without running it). "
             "Faster than run_tests — use this immediately after writing or editing a file. "
             "Returns valid=true if the file parses without errors."
         ),
-        parameters_schema=model_to_json_schema(CheckSyntaxParams),
+        parameters_schema=_CHECK_SYNTAX_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=CheckSyntaxParams,
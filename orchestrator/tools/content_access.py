@@ -6,6 +6,9 @@
 # Relationships: Content is stored globally during main execution and
 #               accessed by tools during agent invocation.
 
+import array
+import bisect
+import re
 from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -16,11 +19,53 @@ from .registry import Tool, model_to_json_schema
 # This is set in __main__.py when content is too large to send directly
 _large_content_store: Optional[str] = None
 
+# Derived views of _large_content_store, computed once in set_large_content().
+# The agent typically makes dozens of range/search calls against the same blob,
+# so scanning for line breaks on every call would repeat O(N) work each time.
+# Only line-break offsets (8 bytes per line) are kept, never a per-line copy of
+# the text: individual lines are sliced out of the content on demand, so the
+# store costs little more than the content itself. These are only ever
+# replaced together with the raw content; never assign them separately.
+_large_newline_offsets: Optional[array.array] = None
+_large_line_count: int = 0
+
+# True when every line break in the content is a bare "\n". Only then is a
+# raw slice between two offsets identical to "\n".join() of the same lines,
+# so read_content_range can return the slice instead of rebuilding it.
+_large_lf_only: bool = False
+
+# Width of the ">>> " / "    " marker that prefixes each numbered line.
+_MARKER_WIDTH = 4
+
+# Matches exactly the boundaries str.splitlines() splits on, so that
+# _large_newline_offsets[i] is the index where line i ends.
+# "\r\n" must come first so a CRLF pair counts as a single boundary.
+_LINE_BREAK_RE = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
 
 def set_large_content(content: str) -> None:
     """Store large content for incremental access by tools."""
-    global _large_content_store
+    global _large_content_store, _large_newline_offsets, _large_line_count, _large_lf_only
     _large_content_store = content
+    _large_newline_offsets = array.array(
+        "Q", (m.start() for m in _LINE_BREAK_RE.finditer(content))
+    )
+    # Same count as len(content.splitlines()): a trailing line break does not
+    # start another line.
+    breaks = len(_large_newline_offsets)
+    _large_line_count = breaks
+    if content and (not breaks or _next_line_start(breaks - 1) < len(content)):
+        _large_line_count += 1
+    _large_lf_only = "\r" not in content and content.count("\n") == breaks
+
+
+def clear_large_content() -> None:
+    """Drop the stored content and its derived views so the memory can be freed."""
+    global _large_content_store, _large_newline_offsets, _large_line_count, _large_lf_only
+    _large_content_store = None
+    _large_newline_offsets = None
+    _large_line_count = 0
+    _large_lf_only = False
 
 
 def get_large_content() -> Optional[str]:
@@ -28,11 +73,35 @@ def get_large_content() -> Optional[str]:
     return _large_content_store
 
 
+def get_large_line_count() -> int:
+    """Get the number of lines in the stored content (as str.splitlines() counts them)."""
+    return _large_line_count
+
+
 def has_large_content() -> bool:
     """Check if large content is available."""
     return _large_content_store is not None
 
 
+def _line_end(index: int) -> int:
+    """Return the content offset at which 0-indexed line `index` ends."""
+    if index < len(_large_newline_offsets):
+        return _large_newline_offsets[index]
+    return len(_large_content_store)
+
+
+def _next_line_start(index: int) -> int:
+    """Return the content offset at which the line after 0-indexed `index` starts."""
+    end = _line_end(index)
+    return end + (2 if _large_content_store.startswith("\r\n", end) else 1)
+
+
+def _line(index: int) -> str:
+    """Return 0-indexed line `index` without its line break."""
+    start = _next_line_start(index - 1) if index else 0
+    return _large_content_store[start:_line_end(index)]
+
+
 # ---------------------------------------------------------------------------
 # read_content_range
 # ---------------------------------------------------------------------------
@@ -57,6 +126,9 @@ class ReadContentRangeParams(BaseModel):
     )
 
 
+_READ_CONTENT_RANGE_SCHEMA = model_to_json_schema(ReadContentRangeParams)
+
+
 class ReadContentRangeResult(BaseModel):
     content: str = Field(description="The requested content range.")
     start_line: int = Field(description="Actual starting line number.")
@@ -72,9 +144,7 @@ def make_read_content_range_tool() -> Tool:
         if not has_large_content():
             return {"error": "No large content available. This tool only works with piped input that exceeded context limits."}
 
-        content = get_large_content()
-        lines = content.splitlines()
-        total_lines = len(lines)
+        total_lines = get_large_line_count()
 
         start_line = params["start_line"] - 1  # Convert to 0-indexed
         end_line = params.get("end_line")
@@ -88,23 +158,36 @@ def make_read_content_range_tool() -> Tool:
         else:
             end_line = min(end_line, total_lines)
 
-        # Extract the requested line range
-        selected_lines = lines[start_line:end_line]
-        content_range = '\n'.join(selected_lines)
-
-        # Apply character limit
-        truncated = False
-        if len(content_range) > max_chars:
-            content_range = content_range[:max_chars]
-            truncated = True
-
-        return ReadContentRangeResult(
-            content=content_range,
-            start_line=start_line + 1,  # Convert back to 1-indexed
-            end_line=min(end_line, len(selected_lines) + start_line),
-            total_lines=total_lines,
-            truncated=truncated
-        ).model_dump()
+        selected_count = max(0, end_line - start_line)
+
+        if _large_lf_only and selected_count:
+            # Fast path: the range is one contiguous run of the original
+            # content, so slice it directly (capped at max_chars) instead of
+            # copying each line and joining them back together.
+            range_start = _next_line_start(start_line - 1) if start_line else 0
+            range_end = _line_end(end_line - 1)
+            truncated = range_end - range_start > max_chars
+            content_range = _large_content_store[
+                range_start:min(range_end, range_start + max_chars)
+            ]
+        else:
+            # Mixed line endings ("\r\n", "\r", ...) are normalised to "\n"
+            # here, which a raw slice would not do.
+            content_range = '\n'.join(_line(i) for i in range(start_line, end_line))
+
+            # Apply character limit
+            truncated = False
+            if len(content_range) > max_chars:
+                content_range = content_range[:max_chars]
+                truncated = True
+
+        return {
+            "content": content_range,
+            "start_line": start_line + 1,  # Convert back to 1-indexed
+            "end_line": min(end_line, start_line + selected_count),
+            "total_lines": total_lines,
+            "truncated": truncated,
+        }
 
     return Tool(
         name="read_content_range",
@@ -113,7 +196,7 @@ def make_read_content_range_tool() -> Tool:
             "Use this when the input data was too large to fit in the initial context. "
             "Lines are 1-indexed. Content is truncated if it exceeds max_chars."
         ),
-        parameters_schema=model_to_json_schema(ReadContentRangeParams),
+        parameters_schema=_READ_CONTENT_RANGE_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=ReadContentRangeParams,
@@ -142,6 +225,9 @@ class SearchContentParams(BaseModel):
     )
 
 
+_SEARCH_CONTENT_SCHEMA = model_to_json_schema(SearchContentParams)
+
+
 class ContentMatch(BaseModel):
     line_number: int = Field(description="Line number where match was found (1-indexed).")
     content: str = Field(description="The matching line with context.")
@@ -161,36 +247,54 @@ def make_search_content_tool() -> Tool:
             return {"error": "No large content available. This tool only works with piped input that exceeded context limits."}
 
         content = get_large_content()
-        lines = content.splitlines()
+        total_lines = get_large_line_count()
         pattern = params["pattern"]
         max_results = params.get("max_results", 10)
         context_lines = params.get("context_lines", 2)
 
+        # Scan the raw content with str.find (a C-level search) and map each
+        # hit to its line via the cached line-break offsets, instead of
+        # testing `pattern in line` for every line in Python.
         matches = []
-        for i, line in enumerate(lines, 1):  # 1-indexed line numbers
-            if pattern in line:
-                # Build context around the match
-                start_ctx = max(0, i - context_lines - 1)
-                end_ctx = min(len(lines), i + context_lines)
-
-                context_lines_list = []
-                for ctx_idx in range(start_ctx, end_ctx):
-                    marker = ">>> " if ctx_idx + 1 == i else "    "
-                    context_lines_list.append(f"{marker}{ctx_idx + 1:4d}: {lines[ctx_idx]}")
-
-                match_content = '\n'.join(context_lines_list)
-                matches.append(ContentMatch(line_number=i, content=match_content).model_dump())
-
-                if len(matches) >= max_results:
-                    break
+        pos = 0
+        while len(matches) < max_results:
+            hit = content.find(pattern, pos)
+            if hit < 0:
+                break
+            index = bisect.bisect_left(_large_newline_offsets, hit)
+            if index >= total_lines:
+                break  # empty pattern found after the final line break
+            line_start = _next_line_start(index - 1) if index else 0
+            if hit < line_start or hit + len(pattern) > _line_end(index):
+                # The match touches a line break (e.g. the "\n" of "\r\n").
+                # Matching has always been per line, so skip it.
+                pos = hit + 1
+                continue
+            i = index + 1  # 1-indexed line number
+
+            # Build context around the match
+            start_ctx = max(0, i - context_lines - 1)
+            end_ctx = min(total_lines, i + context_lines)
+
+            # Only the context lines are rendered, sliced out of the content.
+            context_lines_list = [
+                f"{'>>> ' if n == i else ' ' * _MARKER_WIDTH}{n:4d}: {_line(n - 1)}"
+                for n in range(start_ctx + 1, end_ctx + 1)
+            ]
+
+            match_content = '\n'.join(context_lines_list)
+            matches.append({"line_number": i, "content": match_content})
+
+            # One match per line, as before: resume at the next line.
+            pos = _next_line_start(index)
 
         truncated = len(matches) >= max_results
 
-        return SearchContentResult(
-            matches=matches,
-            total_matches=len(matches),
-            truncated=truncated
-        ).model_dump()
+        return {
+            "matches": matches,
+            "total_matches": len(matches),
+            "truncated": truncated,
+        }
 
     return Tool(
         name="search_content",
@@ -199,7 +303,7 @@ def make_search_content_tool() -> Tool:
             "Returns matches with surrounding context lines. "
             "Use this to find specific information in large files."
         ),
-        parameters_schema=model_to_json_schema(SearchContentParams),
+        parameters_schema=_SEARCH_CONTENT_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=SearchContentParams,
@@ -210,11 +314,19 @@ def make_search_content_tool() -> Tool:
 # get_content_info
 # ---------------------------------------------------------------------------
 
+class GetContentInfoParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    # No parameters — reports on whatever content is currently stored.
+
+
+_GET_CONTENT_INFO_SCHEMA = model_to_json_schema(GetContentInfoParams)
+
+
 class GetContentInfoResult(BaseModel):
     available: bool = Field(description="True if large content is available.")
-    total_lines: Optional[int] = Field(description="Total number of lines in the content.")
-    total_chars: Optional[int] = Field(description="Total number of characters in the content.")
-    estimated_tokens: Optional[int] = Field(description="Estimated token count (~4 chars per token).")
+    total_lines: Optional[int] = Field(default=None, description="Total number of lines in the content.")
+    total_chars: Optional[int] = Field(default=None, description="Total number of characters in the content.")
+    estimated_tokens: Optional[int] = Field(default=None, description="Estimated token count (~4 chars per token).")
 
 
 def make_get_content_info_tool() -> Tool:
@@ -222,20 +334,20 @@ def make_get_content_info_tool() -> Tool:
 
     def execute(params: dict) -> dict:
         if not has_large_content():
-            return GetContentInfoResult(available=False).model_dump()
-
-        content = get_large_content()
-        lines = content.splitlines()
-        total_lines = len(lines)
-        total_chars = len(content)
-        estimated_tokens = total_chars // 4  # Rough estimate
-
-        return GetContentInfoResult(
-            available=True,
-            total_lines=total_lines,
-            total_chars=total_chars,
-            estimated_tokens=estimated_tokens
-        ).model_dump()
+            return {
+                "available": False,
+                "total_lines": None,
+                "total_chars": None,
+                "estimated_tokens": None,
+            }
+
+        total_chars = len(get_large_content())
+        return {
+            "available": True,
+            "total_lines": get_large_line_count(),
+            "total_chars": total_chars,
+            "estimated_tokens": total_chars // 4,  # Rough estimate
+        }
 
     return Tool(
         name="get_content_info",
@@ -243,8 +355,8 @@ def make_get_content_info_tool() -> Tool:
             "Get information about large piped input content. "
             "Returns line count, character count, and token estimates."
         ),
-        parameters_schema={"type": "object", "properties": {}},  # No parameters
+        parameters_schema=_GET_CONTENT_INFO_SCHEMA,
         risk_level="low",
         _execute=execute,
-        params_model=None,
-    )
\ No newline at end of file
+        params_model=GetContentInfoParams,
+    )
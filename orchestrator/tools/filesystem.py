@@ -1,13 +1,19 @@
 # [SAFETY-CRITICAL] This module controls all filesystem access from agents.
-# The path allowlist check in _is_allowed() is the sole enforcement point
+# The path allowlist check in _allowed_real_path() is the sole enforcement point
 # for the allowed_read and allowed_write config constraints.
 # Do not weaken or remove the path check. Do not modify as part of
 # autonomous improvement tasks.
 #
-# Purpose: Filesystem tools — read_file, write_file, list_directory.
+# Purpose: Filesystem tools — read_file, read_files, write_file, list_directory.
 # Relationships: Registers tools into tools/registry.py via make_* factories;
 #               allowed paths come from config.yaml loaded in main.py.
+#
+# Parameter schemas are generated once at import (_*_SCHEMA) and shared by
+# every tool the factories build; they are read-only prompt material.
 
+import bisect
+import errno
+import os
 from pathlib import Path
 from typing import Any, Optional
 
@@ -16,36 +22,205 @@ from pydantic import BaseModel, ConfigDict, Field
 from .registry import Tool, model_to_json_schema
 
 
-def _is_allowed(path: str, allowed_paths: list[str]) -> bool:
+def _with_sep(path: str) -> str:
+    """Return path with exactly one trailing separator ("/" stays "/")."""
+    return path if path.endswith(os.sep) else path + os.sep
+
+
+def _resolve_allowed(allowed_paths: list[str]) -> tuple[str, ...]:
     """
-    Return True only if path resolves to within one of allowed_paths.
+    Resolve the configured allowed paths into the form _allowed_real_path() expects.
 
-    # We resolve to absolute paths to defeat directory traversal attempts
-    # (e.g. "../../etc/passwd"). expanduser() handles ~ in config values.
-    # Do NOT simplify this to a string prefix check — that breaks on
-    # symlinks and relative paths.
+    Each root becomes an absolute, symlink-free string with a trailing
+    separator. The tuple is sorted, and roots nested inside another root are
+    dropped (the outer root already admits everything under them).
+
+    # Called once per tool at factory time rather than on every call:
+    # realpath() lstat()s every path component, and the allowlist does not
+    # change while the process runs. If config reloading is ever added,
+    # the tools must be rebuilt for a new allowlist to take effect.
     """
-    resolved = Path(path).resolve()
-    for allowed in allowed_paths:
-        allowed_resolved = Path(allowed).expanduser().resolve()
-        try:
-            resolved.relative_to(allowed_resolved)
-            return True
-        except ValueError:
+    roots = sorted({_with_sep(os.path.realpath(os.path.expanduser(p))) for p in allowed_paths})
+    pruned: list[str] = []
+    for root in roots:
+        # [INVARIANT] In sorted order every string between a root and a path
+        # under it also starts with that root, so comparing against the
+        # last kept root is enough to find every nested one.
+        if not pruned or not root.startswith(pruned[-1]):
+            pruned.append(root)
+    return tuple(pruned)
+
+
+def _root_of(resolved: str, allowed_resolved: tuple[str, ...]) -> Optional[str]:
+    """
+    Return the allowed root containing the already-resolved path, or None.
+
+    # The roots are sorted and non-overlapping, so the only root that can
+    # be a prefix of the path is the greatest one not above it: one bisect
+    # replaces a scan over every root.
+    """
+    candidate = _with_sep(resolved)
+    i = bisect.bisect_right(allowed_resolved, candidate) - 1
+    if i >= 0 and candidate.startswith(allowed_resolved[i]):
+        return allowed_resolved[i]
+    return None
+
+
+def _is_planted_symlink(path: str, allowed_resolved: tuple[str, ...]) -> bool:
+    """
+    Return True if path itself is a symlink located inside an allowed root.
+
+    path must be absolute with no trailing separator or "." component:
+    lstat() follows a link named with a trailing "/" or "/.", so such a
+    spelling would hide it. The link's location is its resolved parent
+    directory plus its name, so a root that is itself reached through a
+    symlink (e.g. a symlinked ~/project in config) is not a planted link;
+    only links below a root are.
+    """
+    if not os.path.islink(path):
+        return False
+    parent, name = os.path.split(path)
+    location = os.path.join(os.path.realpath(parent), name)
+    root = _root_of(location, allowed_resolved)
+    return root is not None and _with_sep(location) != root
+
+
+def _has_planted_symlink(path: str, allowed_resolved: tuple[str, ...]) -> bool:
+    """
+    Return True if path, or any directory it passes through, is a symlink
+    inside an allowed root.
+
+    # Walks the components as written, one prefix at a time, rather than a
+    # normpath()ed form: normpath() would collapse "link/.." lexically and
+    # skip the link the kernel actually traverses. Empty and "." components
+    # are dropped so every prefix is lstat()ed without a trailing separator.
+    # Components that do not exist yet (write_file creates parents) are not
+    # links and pass.
+    """
+    if not os.path.isabs(path):
+        path = os.path.join(os.getcwd(), path)
+    prefix = os.sep
+    for part in path.split(os.sep):
+        if part in ("", "."):
             continue
+        prefix = os.path.join(prefix, part)
+        if _is_planted_symlink(prefix, allowed_resolved):
+            return True
     return False
 
 
+def _allowed_real_path(path: str, allowed_resolved: tuple[str, ...]) -> Optional[str]:
+    """
+    Return path resolved with os.path.realpath() if it lies within one of
+    allowed_resolved and neither path nor any directory on the way to it is
+    a symlink planted inside an allowed root; otherwise return None.
+
+    allowed_resolved must come from _resolve_allowed(). Tools open the
+    returned path, not the one the agent supplied.
+
+    # We resolve to absolute paths to defeat directory traversal attempts
+    # (e.g. "../../etc/passwd"). expanduser() on the allowlist handles ~ in
+    # config values.
+    # os.path.realpath() rather than Path.resolve(): resolve() is realpath()
+    # plus an extra stat() whose only purpose is to raise RuntimeError on a
+    # symlink loop, which would escape the tools' error handling. A looping
+    # path either fails this check or fails at open() with ELOOP.
+    # Every call resolves for real. Do NOT add a "no symlinks under the
+    # roots" shortcut: agents can create symlinks (shell_run, git checkout)
+    # at any time, so such a flag would go stale and admit an escape.
+    # Do NOT compare unresolved paths or drop the trailing separators —
+    # that breaks on symlinks and relative paths, and "/etcfoo" would match
+    # "/etc". With both sides resolved and ending in a separator, a prefix
+    # match means whole path components match.
+    # [SAFETY-CRITICAL] A symlink inside the allowed tree is refused even if
+    # it currently points inside the allowlist: its target can be swapped
+    # between this check and the open(). The lstat() walk runs before
+    # realpath(), so the reject path never canonicalises a link.
+    # The tools open the resolved path (so a root reached through a symlink
+    # still works) with O_NOFOLLOW. That only guards the final component: a
+    # file swapped for a symlink after this check fails the open, but a
+    # directory higher up swapped for one in that window is still followed.
+    """
+    if _has_planted_symlink(path, allowed_resolved):
+        return None
+    real = os.path.realpath(path)
+    if _root_of(real, allowed_resolved) is None:
+        return None
+    return real
+
+
 # ---------------------------------------------------------------------------
 # read_file
 # ---------------------------------------------------------------------------
 
+# Added to every os.open() of a checked path: the final component must not
+# be a symlink at open time (see _allowed_real_path). 0 where unsupported.
+_O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
+# Chunk size for reading past the fstat() size (procfs files report 0).
+_READ_CHUNK = 64 * 1024
+
+# Largest file read_file / read_files will return. Anything bigger could not
+# fit in a model context anyway, and reading it would only inflate the
+# orchestrator's memory; the agent gets an error and can read a smaller file.
+_MAX_READ_BYTES = 8 * 1024 * 1024
+
+
+def _too_large_message(path: str) -> str:
+    return f"File too large to read: {path!r} exceeds {_MAX_READ_BYTES // (1024 * 1024)} MB"
+
+
+def _read_text_utf8(path: str) -> str:
+    """
+    Read path as UTF-8 text with universal newlines, like Path.read_text().
+
+    Raises ValueError for files over _MAX_READ_BYTES.
+
+    # Reads straight into a bytearray sized from fstat() and decodes it in
+    # place. Path.read_text() goes through a buffered text wrapper that
+    # holds both the bytes and the decoded str at once; this halves peak
+    # memory on multi-MB files. The newline translation below keeps the
+    # returned text identical to what read_text() produced.
+    """
+    fd = os.open(path, os.O_RDONLY | _O_NOFOLLOW)
+    try:
+        size = os.fstat(fd).st_size
+        if size > _MAX_READ_BYTES:
+            raise ValueError(_too_large_message(path))
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+        buf = bytearray(size)
+        offset = 0
+        with memoryview(buf) as view:
+            while offset < size:
+                n = os.readv(fd, [view[offset:]])
+                if n == 0:
+                    break  # file shrank after fstat()
+                offset += n
+        del buf[offset:]
+        # st_size is 0 for pseudo-files and stale if the file grew after
+        # fstat(); pick up anything left before EOF.
+        while chunk := os.read(fd, _READ_CHUNK):
+            buf += chunk
+            if len(buf) > _MAX_READ_BYTES:
+                raise ValueError(_too_large_message(path))
+    finally:
+        os.close(fd)
+    text = buf.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 class ReadFileParams(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     path: str = Field(description="Path to the file to read.")
 
 
+_READ_FILE_SCHEMA = model_to_json_schema(ReadFileParams)
+
+
 class ReadFileResult(BaseModel):
     content: str = Field(description="Full UTF-8 text content of the file.")
     path: str = Field(description="Resolved path that was read.")
@@ -53,16 +228,18 @@ class ReadFileResult(BaseModel):
 
 def make_read_file_tool(allowed_paths: list[str]) -> Tool:
     """Return a read_file Tool restricted to the given allowed_paths."""
+    allowed_resolved = _resolve_allowed(allowed_paths)
 
     def execute(params: dict) -> dict:
         path = params["path"]
-        if not _is_allowed(path, allowed_paths):
+        real = _allowed_real_path(path, allowed_resolved)
+        if real is None:
             # Return an error dict rather than raising so the agent sees
             # a structured response and can try a different path.
             return {"error": f"Path not in allowed_read list: {path!r}"}
         try:
-            content = Path(path).read_text(encoding="utf-8")
-            return ReadFileResult(content=content, path=path).model_dump()
+            content = _read_text_utf8(real)
+            return {"content": content, "path": path}
         except FileNotFoundError:
             return {"error": f"File not found: {path!r}"}
         except Exception as exc:
@@ -74,13 +251,86 @@ def make_read_file_tool(allowed_paths: list[str]) -> Tool:
             "Read the full text content of a file. "
             "Only paths within the configured allowed_read list are accessible."
         ),
-        parameters_schema=model_to_json_schema(ReadFileParams),
+        parameters_schema=_READ_FILE_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=ReadFileParams,
     )
 
 
+# ---------------------------------------------------------------------------
+# read_files
+# ---------------------------------------------------------------------------
+
+# Upper bound on paths per read_files call. Keeps a single tool result from
+# dwarfing the rest of the context window.
+_MAX_BATCH_FILES = 20
+
+
+class ReadFilesParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    paths: list[str] = Field(
+        min_length=1,
+        max_length=_MAX_BATCH_FILES,
+        description="Paths of the files to read.",
+    )
+
+
+_READ_FILES_SCHEMA = model_to_json_schema(ReadFilesParams)
+
+
+class ReadFilesResult(BaseModel):
+    files: list[dict[str, Any]] = Field(
+        description=(
+            "One entry per requested path, in request order. Each entry has "
+            "'path' plus either 'content' or 'error'."
+        ),
+    )
+
+
+def make_read_files_tool(allowed_paths: list[str]) -> Tool:
+    """
+    Return a read_files Tool that reads several files in one call.
+
+    # Agents often read a handful of related files back to back, and each
+    # read_file costs a full model round trip. Batching them into one tool
+    # call removes those round trips. Files are read with the same
+    # _read_text_utf8() as read_file; a per-file failure is reported in
+    # that file's entry and does not fail the whole batch.
+    """
+    allowed_resolved = _resolve_allowed(allowed_paths)
+
+    def execute(params: dict) -> dict:
+        files: list[dict[str, Any]] = []
+        for path in params["paths"]:
+            real = _allowed_real_path(path, allowed_resolved)
+            if real is None:
+                files.append({"path": path, "error": f"Path not in allowed_read list: {path!r}"})
+                continue
+            try:
+                files.append({"path": path, "content": _read_text_utf8(real)})
+            except FileNotFoundError:
+                files.append({"path": path, "error": f"File not found: {path!r}"})
+            except Exception as exc:
+                files.append({"path": path, "error": str(exc)})
+        return {"files": files}
+
+    return Tool(
+        name="read_files",
+        description=(
+            "Read the full text content of several files in one call. "
+            f"Accepts 1–{_MAX_BATCH_FILES} paths. Prefer this over repeated read_file "
+            "calls when you already know which files you need. "
+            "Only paths within the configured allowed_read list are accessible."
+        ),
+        parameters_schema=_READ_FILES_SCHEMA,
+        risk_level="low",
+        _execute=execute,
+        params_model=ReadFilesParams,
+    )
+
+
 # ---------------------------------------------------------------------------
 # write_file
 # ---------------------------------------------------------------------------
@@ -92,30 +342,53 @@ class WriteFileParams(BaseModel):
     content: str = Field(description="Text content to write.")
 
 
+_WRITE_FILE_SCHEMA = model_to_json_schema(WriteFileParams)
+
+
 class WriteFileResult(BaseModel):
     success: bool = Field(description="True if the file was written successfully.")
     path: str = Field(description="Path that was written.")
-    bytes_written: int = Field(description="Number of bytes written.")
+    bytes_written: int = Field(description="Number of bytes written (UTF-8 encoded size).")
+
+
+def _write_bytes(path: str, data: bytes) -> int:
+    """
+    Create or truncate path and write data to it; return the byte count.
+
+    # Encodes once and writes through a raw fd: Path.write_text() pushes the
+    # string through a TextIOWrapper and BufferedWriter first. Mode 0o666
+    # (before umask) matches what open(path, "w") creates.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_NOFOLLOW, 0o666)
+    try:
+        with memoryview(data) as view:
+            written = 0
+            while written < len(data):
+                written += os.write(fd, view[written:])
+    finally:
+        os.close(fd)
+    return written
 
 
 def make_write_file_tool(allowed_paths: list[str]) -> Tool:
     """Return a write_file Tool restricted to the given allowed_paths."""
+    allowed_resolved = _resolve_allowed(allowed_paths)
 
     def execute(params: dict) -> dict:
         path = params["path"]
-        if not _is_allowed(path, allowed_paths):
+        real = _allowed_real_path(path, allowed_resolved)
+        if real is None:
             return {"error": f"Path not in allowed_write list: {path!r}"}
         try:
-            p = Path(path)
             # Create parent directories if they do not exist, matching the
             # behaviour a human would expect when writing to a new path.
-            p.parent.mkdir(parents=True, exist_ok=True)
-            p.write_text(params["content"], encoding="utf-8")
-            return WriteFileResult(
-                success=True,
-                path=path,
-                bytes_written=len(params["content"]),
-            ).model_dump()
+            Path(real).parent.mkdir(parents=True, exist_ok=True)
+            bytes_written = _write_bytes(real, params["content"].encode("utf-8"))
+            return {
+                "success": True,
+                "path": path,
+                "bytes_written": bytes_written,
+            }
         except Exception as exc:
             return {"error": str(exc)}
 
@@ -126,7 +399,7 @@ def make_write_file_tool(allowed_paths: list[str]) -> Tool:
             "Only paths within the configured allowed_write list are writable. "
             "Overwrites the file if it already exists."
         ),
-        parameters_schema=model_to_json_schema(WriteFileParams),
+        parameters_schema=_WRITE_FILE_SCHEMA,
         risk_level="medium",
         _execute=execute,
         params_model=WriteFileParams,
@@ -143,6 +416,9 @@ class ListDirectoryParams(BaseModel):
     path: str = Field(description="Path to the directory to list.")
 
 
+_LIST_DIRECTORY_SCHEMA = model_to_json_schema(ListDirectoryParams)
+
+
 class DirectoryEntry(BaseModel):
     name: str = Field(description="Entry name (filename or directory name).")
     type: str = Field(description="'file' or 'dir'.")
@@ -155,25 +431,64 @@ class ListDirectoryResult(BaseModel):
     )
 
 
+def _entry_kind(entry: os.DirEntry) -> str:
+    """Classify a scandir entry as 'dir', 'file' or 'other' (following symlinks)."""
+    try:
+        if entry.is_dir():
+            return "dir"
+        if entry.is_file():
+            return "file"
+    except OSError:
+        # One unreadable entry should not fail the whole listing.
+        pass
+    return "other"
+
+
 def make_list_directory_tool(allowed_paths: list[str]) -> Tool:
     """Return a list_directory Tool restricted to the given allowed_paths."""
+    allowed_resolved = _resolve_allowed(allowed_paths)
 
     def execute(params: dict) -> dict:
         path = params["path"]
-        if not _is_allowed(path, allowed_paths):
+        real = _allowed_real_path(path, allowed_resolved)
+        if real is None:
             return {"error": f"Path not in allowed_read list: {path!r}"}
         try:
-            p = Path(path)
-            if not p.is_dir():
-                return {"error": f"Not a directory: {path!r}"}
-            entries = sorted(p.iterdir(), key=lambda e: (e.is_file(), e.name))
-            entry_dicts = [
-                DirectoryEntry(name=e.name, type="dir" if e.is_dir() else "file").model_dump()
-                for e in entries
-            ]
-            return ListDirectoryResult(path=path, entries=entry_dicts).model_dump()
+            # os.scandir() rather than Path.iterdir(): DirEntry answers
+            # is_dir()/is_file() from the d_type returned with the listing
+            # and caches the result, where each Path.is_*() call is a fresh
+            # stat(). Entry symlinks are still followed, as before; the
+            # directory itself is opened with O_NOFOLLOW and listed by fd.
+            fd = os.open(real, os.O_RDONLY | os.O_DIRECTORY | _O_NOFOLLOW)
+            try:
+                with os.scandir(fd) as it:
+                    classified = [(_entry_kind(e), e.name) for e in it]
+            finally:
+                os.close(fd)
+        except FileNotFoundError:
+            return {"error": f"No such directory: {path!r}"}
+        except NotADirectoryError:
+            # With O_DIRECTORY, Linux reports a final symlink as ENOTDIR
+            # rather than O_NOFOLLOW's ELOOP.
+            if os.path.islink(real):
+                return {"error": f"Refusing to follow symlink: {path!r}"}
+            return {"error": f"Not a directory: {path!r}"}
+        except OSError as exc:
+            if exc.errno == errno.ELOOP:
+                return {"error": f"Refusing to follow symlink: {path!r}"}
+            return {"error": str(exc)}
         except Exception as exc:
             return {"error": str(exc)}
+        # Directories (and entries that are neither file nor dir) sort
+        # before files, then by name.
+        classified.sort(key=lambda kind_name: (kind_name[0] == "file", kind_name[1]))
+        return {
+            "path": path,
+            "entries": [
+                {"name": name, "type": "dir" if kind == "dir" else "file"}
+                for kind, name in classified
+            ],
+        }
 
     return Tool(
         name="list_directory",
@@ -182,7 +497,7 @@ def make_list_directory_tool(allowed_paths: list[str]) -> Tool:
             "Returns entry names and types (file or dir). "
             "Only paths within the configured allowed_read list are accessible."
         ),
-        parameters_schema=model_to_json_schema(ListDirectoryParams),
+        parameters_schema=_LIST_DIRECTORY_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=ListDirectoryParams,
@@ -6,8 +6,15 @@
 
 # All tools call subprocess git with a fixed argv list (shell=False) to prevent
 # injection. git_rollback is high-risk and requires human approval before execution.
+#
+# Each tool's parameters JSON Schema is generated once at import (the
+# _*_SCHEMA constants) rather than inside its make_* factory, so building a
+# tool again (per registry, per test) does not repeat pydantic's schema walk.
 
+import os
+import selectors
 import subprocess
+import time
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -15,35 +22,120 @@ from .registry import Tool, model_to_json_schema
 
 _GIT_TIMEOUT = 60  # seconds; git operations on a local repo should never take longer
 
+# Global option for the read-only queries. Without it `git status` refreshes
+# stale stat data in the index as a side effect, taking index.lock while it
+# does; a git command the user runs at the same moment can then fail on the
+# lock. (Porcelain `git diff` still refreshes quietly, skipping the write if
+# the lock is taken, so it cannot make anyone else fail.)
+_NO_LOCKS = "--no-optional-locks"
 
-def _git(args: list[str]) -> dict:
+_GIT_OUTPUT_LIMIT = 1024 * 1024  # bytes kept per stream; the rest is discarded
+_GIT_READ_CHUNK = 64 * 1024
+_TRUNCATION_NOTE = "[output truncated at {} bytes]"
+
+
+def _git_start(args: list[str]) -> "subprocess.Popen | dict":
     """
-    Run 'git <args>' and return stdout, stderr, and returncode.
+    Start 'git <args>' without waiting for it.
 
-    Uses shell=False unconditionally. Never call this with user-supplied
-    strings that have not been validated by the tool's parameter schema.
+    Returns the running process, or a _git()-shaped error dict if git could
+    not be started. Pass the result to _git_wait(). Uses shell=False
+    unconditionally.
     """
     try:
-        proc = subprocess.run(
-            ["git"] + args,
-            capture_output=True,
-            text=True,
-            timeout=_GIT_TIMEOUT,
+        return subprocess.Popen(
+            ("git", *args),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             shell=False,
         )
-        return {
-            "stdout": proc.stdout.strip(),
-            "stderr": proc.stderr.strip(),
-            "returncode": proc.returncode,
-        }
-    except subprocess.TimeoutExpired:
-        return {"stdout": "", "stderr": "git timed out", "returncode": -1}
     except FileNotFoundError:
         return {"stdout": "", "stderr": "git not found in PATH", "returncode": -1}
     except Exception as exc:
         return {"stdout": "", "stderr": str(exc), "returncode": -1}
 
 
+def _git_wait(proc: "subprocess.Popen | dict", deadline: float) -> dict:
+    """
+    Wait for a process from _git_start() and return stdout, stderr, returncode.
+
+    stdout and stderr are decoded as UTF-8 (invalid bytes replaced) with
+    trailing whitespace removed. Each stream keeps at most _GIT_OUTPUT_LIMIT
+    bytes; anything past that is read and discarded so git can finish, and
+    the text ends with a note saying it was truncated.
+
+    deadline is a time.monotonic() value; a process still running then is
+    killed and reported as timed out.
+    """
+    if isinstance(proc, dict):
+        return proc
+    # Both pipes are drained through one select loop, as communicate() does,
+    # but into bounded buffers: `git diff HEAD` over a large generated file
+    # can run to hundreds of megabytes, none of which fits in a prompt.
+    out_fd, err_fd = proc.stdout.fileno(), proc.stderr.fileno()
+    captured = {out_fd: bytearray(), err_fd: bytearray()}
+    truncated = set()
+    try:
+        with selectors.DefaultSelector() as selector:
+            for fd in captured:
+                selector.register(fd, selectors.EVENT_READ)
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(proc.args, _GIT_TIMEOUT)
+                for key, _ in selector.select(remaining):
+                    chunk = os.read(key.fd, _GIT_READ_CHUNK)
+                    if not chunk:
+                        selector.unregister(key.fd)
+                        continue
+                    buffer = captured[key.fd]
+                    room = _GIT_OUTPUT_LIMIT - len(buffer)
+                    if len(chunk) > room:
+                        truncated.add(key.fd)
+                        chunk = chunk[:room]
+                    buffer += chunk
+        proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        return {"stdout": "", "stderr": "git timed out", "returncode": -1}
+    except Exception as exc:
+        proc.kill()
+        proc.wait()
+        return {"stdout": "", "stderr": str(exc), "returncode": -1}
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
+    return {
+        "stdout": _decode(captured[out_fd], out_fd in truncated),
+        "stderr": _decode(captured[err_fd], err_fd in truncated),
+        "returncode": proc.returncode,
+    }
+
+
+def _decode(output: bytearray, truncated: bool) -> str:
+    """Decode captured git output, noting if the tail was discarded."""
+    # Trimmed as bytes, then decoded once. Only trailing whitespace is
+    # dropped: leading spaces are significant in the first line of
+    # `status --short` or `diff --stat` output. "replace" keeps diffs of
+    # non-UTF-8 files (or a cut through a multi-byte character) from
+    # failing the whole call.
+    text = output.rstrip().decode("utf-8", "replace")
+    if truncated:
+        text += "\n" + _TRUNCATION_NOTE.format(_GIT_OUTPUT_LIMIT)
+    return text
+
+
+def _git(args: list[str]) -> dict:
+    """
+    Run 'git <args>' and return stdout, stderr, and returncode.
+
+    Uses shell=False unconditionally. Never call this with user-supplied
+    strings that have not been validated by the tool's parameter schema.
+    """
+    return _git_wait(_git_start(args), time.monotonic() + _GIT_TIMEOUT)
+
+
 # ---------------------------------------------------------------------------
 # git_status
 # ---------------------------------------------------------------------------
@@ -53,6 +145,9 @@ class GitStatusParams(BaseModel):
     # No parameters — git_status always reports current repo state.
 
 
+_GIT_STATUS_SCHEMA = model_to_json_schema(GitStatusParams)
+
+
 class GitStatusResult(BaseModel):
     branch: str = Field(description="Current branch name.")
     status: str = Field(description="Working tree status in short format.")
@@ -60,19 +155,50 @@ class GitStatusResult(BaseModel):
     returncode: int = Field(description="Return code from git status.")
 
 
+def _parse_branch_header(header: str) -> str:
+    """
+    Return the branch name from a `git status --branch` "## " header line.
+
+    "## main...origin/main [ahead 1]" -> "main"; "## No commits yet on main"
+    -> "main"; a detached HEAD ("## HEAD (no branch)") -> "HEAD", which is
+    what `git rev-parse --abbrev-ref HEAD` reports. Returns "" for anything
+    else (e.g. git failed and printed no header).
+    """
+    if not header.startswith("## "):
+        return ""
+    head = header[3:]
+    for prefix in ("No commits yet on ", "Initial commit on "):
+        if head.startswith(prefix):
+            return head[len(prefix):]
+    if head.startswith("HEAD (no branch)"):
+        return "HEAD"
+    # Branch names cannot contain "..." or spaces, so these splits are safe.
+    return head.split("...", 1)[0].split(" ", 1)[0]
+
+
 def make_git_status_tool() -> Tool:
     """Return a git_status tool that reports current repo state."""
 
     def execute(_params: dict) -> dict:
-        status = _git(["status", "--short"])
-        diff_stat = _git(["diff", "--stat", "HEAD"])
-        branch = _git(["rev-parse", "--abbrev-ref", "HEAD"])
-        return GitStatusResult(
-            branch=branch["stdout"],
-            status=status["stdout"],
-            diff_stat=diff_stat["stdout"],
-            returncode=status["returncode"],
-        ).model_dump()
+        # --branch puts the branch in a "## " header line of the status
+        # output, so one git process answers both questions. The two
+        # remaining queries are independent: start both before waiting on
+        # either, so wall time is the slower one, not the sum.
+        deadline = time.monotonic() + _GIT_TIMEOUT
+        procs = [
+            _git_start([_NO_LOCKS, "status", "--short", "--branch"]),
+            _git_start([_NO_LOCKS, "diff", "--stat", "HEAD"]),
+        ]
+        status, diff_stat = (_git_wait(proc, deadline) for proc in procs)
+        header, _, entries = status["stdout"].partition("\n")
+        if not header.startswith("## "):
+            header, entries = "", status["stdout"]
+        return {
+            "branch": _parse_branch_header(header),
+            "status": entries,
+            "diff_stat": diff_stat["stdout"],
+            "returncode": status["returncode"],
+        }
 
     return Tool(
         name="git_status",
@@ -80,7 +206,7 @@ def make_git_status_tool() -> Tool:
             "Return the current git branch, working tree status (short format), "
             "and a diff stat against HEAD."
         ),
-        parameters_schema=model_to_json_schema(GitStatusParams),
+        parameters_schema=_GIT_STATUS_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=GitStatusParams,
@@ -97,6 +223,9 @@ class GitCommitParams(BaseModel):
     message: str = Field(min_length=1, description="Commit message.")
 
 
+_GIT_COMMIT_SCHEMA = model_to_json_schema(GitCommitParams)
+
+
 class GitCommitResult(BaseModel):
     stdout: str = Field(description="Standard output from git commit.")
     stderr: str = Field(description="Standard error from git commit.")
@@ -110,12 +239,12 @@ def make_git_commit_tool() -> Tool:
     def execute(params: dict) -> dict:
         message = params["message"]
         result = _git(["commit", "-m", message])
-        return GitCommitResult(
-            stdout=result["stdout"],
-            stderr=result["stderr"],
-            returncode=result["returncode"],
-            success=result["returncode"] == 0,
-        ).model_dump()
+        return {
+            "stdout": result["stdout"],
+            "stderr": result["stderr"],
+            "returncode": result["returncode"],
+            "success": result["returncode"] == 0,
+        }
 
     return Tool(
         name="git_commit",
@@ -124,7 +253,7 @@ def make_git_commit_tool() -> Tool:
             "Stage files first with git_add before calling this. "
             "Returns success=false if there is nothing staged or another error occurs."
         ),
-        parameters_schema=model_to_json_schema(GitCommitParams),
+        parameters_schema=_GIT_COMMIT_SCHEMA,
         risk_level="medium",
         _execute=execute,
         params_model=GitCommitParams,
@@ -145,6 +274,9 @@ class GitBranchParams(BaseModel):
     )
 
 
+_GIT_BRANCH_SCHEMA = model_to_json_schema(GitBranchParams)
+
+
 class GitBranchResult(BaseModel):
     stdout: str = Field(description="Standard output from git checkout.")
     stderr: str = Field(description="Standard error from git checkout.")
@@ -164,12 +296,12 @@ def make_git_branch_tool() -> Tool:
         else:
             result = _git(["checkout", name])
 
-        return GitBranchResult(
-            stdout=result["stdout"],
-            stderr=result["stderr"],
-            returncode=result["returncode"],
-            success=result["returncode"] == 0,
-        ).model_dump()
+        return {
+            "stdout": result["stdout"],
+            "stderr": result["stderr"],
+            "returncode": result["returncode"],
+            "success": result["returncode"] == 0,
+        }
 
     return Tool(
         name="git_branch",
@@ -177,7 +309,7 @@ def make_git_branch_tool() -> Tool:
             "Switch to an existing branch or create and switch to a new one. "
             "Set create=true to create a new branch from the current HEAD."
         ),
-        parameters_schema=model_to_json_schema(GitBranchParams),
+        parameters_schema=_GIT_BRANCH_SCHEMA,
         risk_level="medium",
         _execute=execute,
         params_model=GitBranchParams,
@@ -201,6 +333,9 @@ class GitRollbackParams(BaseModel):
     )
 
 
+_GIT_ROLLBACK_SCHEMA = model_to_json_schema(GitRollbackParams)
+
+
 class GitRollbackResult(BaseModel):
     stdout: str = Field(description="Standard output from git reset.")
     stderr: str = Field(description="Standard error from git reset.")
@@ -221,14 +356,14 @@ def make_git_rollback_tool() -> Tool:
         reason = params.get("reason", "")
 
         result = _git(["reset", "--hard", to_commit])
-        return GitRollbackResult(
-            stdout=result["stdout"],
-            stderr=result["stderr"],
-            returncode=result["returncode"],
-            success=result["returncode"] == 0,
-            rolled_back_to=to_commit,
-            reason=reason,
-        ).model_dump()
+        return {
+            "stdout": result["stdout"],
+            "stderr": result["stderr"],
+            "returncode": result["returncode"],
+            "success": result["returncode"] == 0,
+            "rolled_back_to": to_commit,
+            "reason": reason,
+        }
 
     return Tool(
         name="git_rollback",
@@ -237,7 +372,7 @@ def make_git_rollback_tool() -> Tool:
             "DESTRUCTIVE: uncommitted changes are lost. Always requires human approval. "
             "Provide a reason so the approval prompt is informative."
         ),
-        parameters_schema=model_to_json_schema(GitRollbackParams),
+        parameters_schema=_GIT_ROLLBACK_SCHEMA,
         risk_level="high",
         _execute=execute,
         params_model=GitRollbackParams,
@@ -253,6 +388,9 @@ class GitDiffParams(BaseModel):
     # No parameters — always diffs working tree against HEAD.
 
 
+_GIT_DIFF_SCHEMA = model_to_json_schema(GitDiffParams)
+
+
 class GitDiffResult(BaseModel):
     diff: str = Field(description="Full diff output from git diff HEAD.")
     returncode: int = Field(description="Return code from git diff.")
@@ -262,16 +400,16 @@ def make_git_diff_tool() -> Tool:
     """Return a git_diff tool that shows the full diff against HEAD."""
 
     def execute(_params: dict) -> dict:
-        result = _git(["diff", "HEAD"])
-        return GitDiffResult(
-            diff=result["stdout"],
-            returncode=result["returncode"],
-        ).model_dump()
+        result = _git([_NO_LOCKS, "diff", "HEAD"])
+        return {
+            "diff": result["stdout"],
+            "returncode": result["returncode"],
+        }
 
     return Tool(
         name="git_diff",
         description="Show the full diff of working tree changes against HEAD.",
-        parameters_schema=model_to_json_schema(GitDiffParams),
+        parameters_schema=_GIT_DIFF_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=GitDiffParams,
@@ -291,6 +429,9 @@ class GitAddParams(BaseModel):
     )
 
 
+_GIT_ADD_SCHEMA = model_to_json_schema(GitAddParams)
+
+
 class GitAddResult(BaseModel):
     stdout: str = Field(description="Standard output from git add.")
     stderr: str = Field(description="Standard error from git add.")
@@ -306,12 +447,12 @@ def make_git_add_tool() -> Tool:
         # The -- separator prevents paths that start with '-' from being
         # mistaken for options. Required when paths come from agent input.
         result = _git(["add", "--"] + paths)
-        return GitAddResult(
-            stdout=result["stdout"],
-            stderr=result["stderr"],
-            returncode=result["returncode"],
-            success=result["returncode"] == 0,
-        ).model_dump()
+        return {
+            "stdout": result["stdout"],
+            "stderr": result["stderr"],
+            "returncode": result["returncode"],
+            "success": result["returncode"] == 0,
+        }
 
     return Tool(
         name="git_add",
@@ -319,7 +460,7 @@ def make_git_add_tool() -> Tool:
             "Stage one or more files for the next commit. "
             "Provide at least one path. Use git_commit after staging."
         ),
-        parameters_schema=model_to_json_schema(GitAddParams),
+        parameters_schema=_GIT_ADD_SCHEMA,
         risk_level="medium",
         _execute=execute,
         params_model=GitAddParams,
@@ -335,35 +476,66 @@ class GitListBranchesParams(BaseModel):
     # No parameters — lists all local and remote branches.
 
 
+_GIT_LIST_BRANCHES_SCHEMA = model_to_json_schema(GitListBranchesParams)
+
+
 class GitListBranchesResult(BaseModel):
     branches: list[str] = Field(
         description="All local and remote branch names, one per entry, trimmed.",
     )
-    current: str = Field(description="The currently checked-out branch name.")
-    returncode: int = Field(description="Return code from git branch.")
+    current: str = Field(
+        description="The currently checked-out branch name; empty when HEAD is detached.",
+    )
+    truncated: bool = Field(
+        description="True when git's output hit the capture limit and later branches are missing.",
+    )
+    returncode: int = Field(description="Return code from git for-each-ref.")
 
 
 def make_git_list_branches_tool() -> Tool:
     """Return a git_list_branches tool that lists all branches."""
 
     def execute(_params: dict) -> dict:
-        result = _git(["branch", "-a"])
+        # for-each-ref is plumbing: a stable, machine-readable record per ref
+        # instead of `git branch -a`'s column-formatted listing. Fields are
+        # NUL-separated (refnames cannot contain NUL or newline).
+        result = _git([
+            _NO_LOCKS,
+            "for-each-ref",
+            "--format=%(HEAD)%00%(refname)%00%(symref:short)",
+            "refs/heads",
+            "refs/remotes",
+        ])
+        records = result["stdout"].splitlines()
+        truncated = bool(records) and records[-1] == _TRUNCATION_NOTE.format(_GIT_OUTPUT_LIMIT)
+        if truncated:
+            # The note follows whatever record the cut went through; that
+            # record may look whole but end early, so drop it as well.
+            records = records[:-2]
         branches = []
         current = ""
-        for raw_line in result["stdout"].splitlines():
-            line = raw_line.strip()
-            if not line:
+        for record in records:
+            fields = record.split("\0")
+            if len(fields) != 3:
                 continue
-            if line.startswith("* "):
-                current = line[2:].strip()
-                branches.append(current)
+            head_marker, refname, symref = fields
+            if refname.startswith("refs/heads/"):
+                name = refname[len("refs/heads/"):]
             else:
-                branches.append(line)
-        return GitListBranchesResult(
-            branches=branches,
-            current=current,
-            returncode=result["returncode"],
-        ).model_dump()
+                # Same spelling as `git branch -a`: "remotes/origin/main",
+                # and "remotes/origin/HEAD -> origin/main" for symbolic refs.
+                name = refname[len("refs/"):]
+                if symref:
+                    name = f"{name} -> {symref}"
+            if head_marker == "*":
+                current = name
+            branches.append(name)
+        return {
+            "branches": branches,
+            "current": current,
+            "truncated": truncated,
+            "returncode": result["returncode"],
+        }
 
     return Tool(
         name="git_list_branches",
@@ -371,7 +543,7 @@ def make_git_list_branches_tool() -> Tool:
             "List all local and remote branches. "
             "Branches named dev-agent/* indicate work ready for human review."
         ),
-        parameters_schema=model_to_json_schema(GitListBranchesParams),
+        parameters_schema=_GIT_LIST_BRANCHES_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=GitListBranchesParams,
@@ -393,21 +565,80 @@ class GitLogParams(BaseModel):
     )
 
 
+_GIT_LOG_SCHEMA = model_to_json_schema(GitLogParams)
+
+
 class GitLogResult(BaseModel):
     log: str = Field(description="Recent commit history in oneline format.")
     returncode: int = Field(description="Return code from git log.")
 
 
+def _ref_file_stamp(path: str) -> tuple[int, int, int] | None:
+    """Return (inode, mtime_ns, size) for path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _head_stamp() -> tuple | None:
+    """
+    Fingerprint what HEAD points at in the repository in the cwd.
+
+    Covers .git/HEAD, the branch ref it names and packed-refs. Git rewrites
+    each of these via a lock file and rename(), so every update gives the
+    file a new inode even when mtime and size happen to repeat. Returns None
+    when the cwd has no plain .git directory (worktrees, subdirectories),
+    in which case callers must not cache.
+    """
+    git_dir = os.path.abspath(".git")
+    head_path = os.path.join(git_dir, "HEAD")
+    head_stamp = _ref_file_stamp(head_path)
+    if head_stamp is None:
+        return None
+    try:
+        with open(head_path, encoding="utf-8") as f:
+            target = f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    stamp: tuple = (git_dir, head_stamp)
+    if target.startswith("ref: "):
+        stamp += (
+            _ref_file_stamp(os.path.join(git_dir, target[len("ref: "):])),
+            _ref_file_stamp(os.path.join(git_dir, "packed-refs")),
+        )
+    return stamp
+
+
 def make_git_log_tool() -> Tool:
-    """Return a git_log tool that shows recent commit history."""
+    """
+    Return a git_log tool that shows recent commit history.
+
+    # Agents call git_log repeatedly while nothing is committed. The output
+    # depends only on the commit HEAD resolves to, so results are remembered
+    # per n and reused while _head_stamp() is unchanged, without starting
+    # git. git_status and git_diff are not cached: they depend on working
+    # tree files, which no cheap stamp covers.
+    """
+    cache: dict[int, tuple[tuple, dict]] = {}
 
     def execute(params: dict) -> dict:
         n = params.get("n", 10)
-        result = _git(["log", "--oneline", f"-{n}"])
-        return GitLogResult(
-            log=result["stdout"],
-            returncode=result["returncode"],
-        ).model_dump()
+        stamp = _head_stamp()
+        if stamp is not None:
+            cached = cache.get(n)
+            if cached is not None and cached[0] == stamp:
+                return dict(cached[1])
+
+        result = _git([_NO_LOCKS, "log", "--oneline", f"-{n}"])
+        log_result = {
+            "log": result["stdout"],
+            "returncode": result["returncode"],
+        }
+        if stamp is not None and result["returncode"] == 0:
+            cache[n] = (stamp, dict(log_result))
+        return log_result
 
     return Tool(
         name="git_log",
@@ -415,7 +646,7 @@ def make_git_log_tool() -> Tool:
             "Return recent commit history in oneline format. "
             "Use n to control how many commits to return (1–100, default 10)."
         ),
-        parameters_schema=model_to_json_schema(GitLogParams),
+        parameters_schema=_GIT_LOG_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=GitLogParams,
@@ -23,6 +23,9 @@ class NotifyUserParams(BaseModel):
     )
 
 
+_NOTIFY_USER_SCHEMA = model_to_json_schema(NotifyUserParams)
+
+
 class NotifyUserResult(BaseModel):
     delivered: bool = Field(description="True if the notification was delivered.")
     channel: str = Field(description="Delivery channel used (e.g. 'terminal').")
@@ -41,7 +44,7 @@ def make_notify_user_tool() -> Tool:
             level, logger.info
         )
         log_fn("[NOTIFY] %s", message)
-        return NotifyUserResult(delivered=True, channel="terminal").model_dump()
+        return {"delivered": True, "channel": "terminal"}
 
     return Tool(
         name="notify_user",
@@ -49,7 +52,7 @@ def make_notify_user_tool() -> Tool:
             "Send a notification message to the user. "
             "Use this to report task completion, errors, or important findings."
         ),
-        parameters_schema=model_to_json_schema(NotifyUserParams),
+        parameters_schema=_NOTIFY_USER_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=NotifyUserParams,
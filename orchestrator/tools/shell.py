@@ -6,8 +6,9 @@
 # Purpose: shell_run (allowlisted shell execution) and run_tests (pytest wrapper).
 # Relationships: Registered into tools/registry.py; allowlist from config.yaml.
 
+import os
 import subprocess
-from typing import Optional, Union
+from typing import AbstractSet, Optional, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -21,8 +22,17 @@ _SHELL_TIMEOUT = 120
 # normal shell command — 300 seconds gives CI-style test runs room to breathe.
 _TEST_TIMEOUT = 300
 
+# CPUs left free when run_tests shards across cores: the orchestrator and,
+# on a home host, often a local model server share the machine with pytest.
+_TEST_RESERVED_CPUS = 2
 
-def _is_allowed_command(command: list[str], allowlist: list[str]) -> bool:
+# What pytest prints (with exit code 4, usage error) when -n is passed and the
+# pytest on PATH has no xdist plugin.
+_PYTEST_USAGE_ERROR = 4
+_XDIST_MISSING = "unrecognized arguments: -n"
+
+
+def _is_allowed_command(command: list[str], allowlist: AbstractSet[str]) -> bool:
     """
     Return True only if the first token of command is in the allowlist.
 
@@ -55,6 +65,9 @@ class ShellRunParams(BaseModel):
     )
 
 
+_SHELL_RUN_SCHEMA = model_to_json_schema(ShellRunParams)
+
+
 class ShellRunResult(BaseModel):
     stdout: str = Field(description="Standard output from the command.")
     stderr: str = Field(description="Standard error from the command.")
@@ -68,7 +81,12 @@ def make_shell_run_tool(allowlist: list[str]) -> Tool:
     The command parameter must be a list of strings (argv-style). This
     prevents shell injection via argument strings — we never pass
     the command to a shell interpreter.
+
+    # The allowlist is copied into a frozenset here, once: membership is a
+    # hash lookup however long the list grows, and later changes to the
+    # caller's list cannot widen what an already-built tool will run.
     """
+    allowed = frozenset(allowlist)
 
     def execute(params: dict) -> dict:
         command = params["command"]
@@ -77,7 +95,7 @@ def make_shell_run_tool(allowlist: list[str]) -> Tool:
         # with shell=False.
         if isinstance(command, str):
             command = command.split()
-        if not _is_allowed_command(command, allowlist):
+        if not _is_allowed_command(command, allowed):
             return {
                 "error": (
                     f"Command {command[0]!r} is not in the shell allowlist. "
@@ -113,7 +131,7 @@ def make_shell_run_tool(allowlist: list[str]) -> Tool:
             "of strings (e.g. ['git', 'status']). Only commands whose base name appears "
             "in the shell_allowlist config key are permitted."
         ),
-        parameters_schema=model_to_json_schema(ShellRunParams),
+        parameters_schema=_SHELL_RUN_SCHEMA,
         risk_level="high",
         _execute=execute,
         params_model=ShellRunParams,
@@ -135,6 +153,17 @@ class RunTestsParams(BaseModel):
         default=False,
         description="If true, pass -v to pytest for verbose output.",
     )
+    parallel: bool = Field(
+        default=False,
+        description=(
+            "If true, spread tests across CPU cores with pytest-xdist. Only for "
+            "suites whose tests do not share state; runs serially if xdist is "
+            "not installed."
+        ),
+    )
+
+
+_RUN_TESTS_SCHEMA = model_to_json_schema(RunTestsParams)
 
 
 class RunTestsResult(BaseModel):
@@ -144,6 +173,19 @@ class RunTestsResult(BaseModel):
     passed: bool = Field(description="True if all tests passed (returncode 0).")
 
 
+def _xdist_workers() -> int:
+    """
+    Return how many pytest-xdist workers run_tests may use, or 0 for serial.
+
+    # Zero when fewer than two CPUs remain after the reservation, where a
+    # single xdist worker only adds start-up cost to a serial run. Whether
+    # xdist is installed is not checked here: the pytest on PATH may live in
+    # another interpreter, so run_tests learns that from pytest itself.
+    """
+    workers = (os.cpu_count() or 1) - _TEST_RESERVED_CPUS
+    return workers if workers >= 2 else 0
+
+
 def make_run_tests_tool() -> Tool:
     """
     Return a run_tests Tool that executes the pytest test suite.
@@ -152,6 +194,19 @@ def make_run_tests_tool() -> Tool:
     the agent cannot supply arbitrary arguments that change what executes.
     The optional path parameter restricts pytest to a subdirectory.
     """
+    # Set to False the first time pytest rejects -n; later parallel requests
+    # from this tool then run serially without trying xdist again.
+    xdist = {}
+    serial_note = "run_tests: parallel run needs pytest-xdist and spare CPUs; ran serially.\n"
+
+    def run(command: list[str]) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            timeout=_TEST_TIMEOUT,
+            shell=False,
+        )
 
     def execute(params: dict) -> dict:
         command = ["pytest"]
@@ -159,17 +214,23 @@ def make_run_tests_tool() -> Tool:
             command.append(params["path"])
         if params.get("verbose"):
             command.append("-v")
+        workers = _xdist_workers() if params.get("parallel") else 0
+        note = ""
+        if params.get("parallel") and not (workers and xdist.get("usable", True)):
+            note = serial_note
+            workers = 0
         try:
-            proc = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=_TEST_TIMEOUT,
-                shell=False,
-            )
+            if workers:
+                proc = run(command + ["-n", str(workers)])
+                if proc.returncode == _PYTEST_USAGE_ERROR and _XDIST_MISSING in proc.stderr:
+                    xdist["usable"] = False
+                    note = serial_note
+                    proc = run(command)
+            else:
+                proc = run(command)
             return RunTestsResult(
                 stdout=proc.stdout,
-                stderr=proc.stderr,
+                stderr=note + proc.stderr,
                 returncode=proc.returncode,
                 passed=proc.returncode == 0,
             ).model_dump()
@@ -186,7 +247,7 @@ def make_run_tests_tool() -> Tool:
             "Run the pytest test suite and return the output. "
             "Optionally restrict to a path or enable verbose output."
         ),
-        parameters_schema=model_to_json_schema(RunTestsParams),
+        parameters_schema=_RUN_TESTS_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=RunTestsParams,
@@ -16,6 +16,13 @@ from pydantic import BaseModel, ConfigDict
 
 from .registry import Tool, model_to_json_schema
 
+# Memory page size in bytes, read once at import: it is fixed for the life of
+# the host. None where os.sysconf or the name is unavailable (e.g. Windows).
+try:
+    _PAGE_SIZE: int | None = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, OSError, ValueError):
+    _PAGE_SIZE = None
+
 
 # ---------------------------------------------------------------------------
 
@@ -24,6 +31,9 @@ class ShowOSParams(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+_SHOW_OS_SCHEMA = model_to_json_schema(ShowOSParams)
+
+
 class ShowOSResult(BaseModel):
     system: str
     node: str
@@ -39,21 +49,26 @@ def make_show_os_tool() -> Tool:
     """
     Return a show_os Tool that returns basic operating system information.
 
-    Uses the built-in platform module to gather system details.
+    Uses the built-in platform module to gather system details. None of
+    them change while the process runs, so the first successful result is
+    kept and copied on later calls; a failed lookup is not cached.
     """
+    cached: dict = {}
 
     def execute(params: dict) -> dict:
         try:
-            return ShowOSResult(
-                system=platform.system(),
-                node=platform.node(),
-                release=platform.release(),
-                version=platform.version(),
-                machine=platform.machine(),
-                processor=platform.processor() or "Unknown",
-                python_version=platform.python_version(),
-                python_implementation=platform.python_implementation(),
-            ).model_dump()
+            if not cached:
+                cached.update(ShowOSResult(
+                    system=platform.system(),
+                    node=platform.node(),
+                    release=platform.release(),
+                    version=platform.version(),
+                    machine=platform.machine(),
+                    processor=platform.processor() or "Unknown",
+                    python_version=platform.python_version(),
+                    python_implementation=platform.python_implementation(),
+                ).model_dump())
+            return dict(cached)
         except Exception as exc:
             return {"error": f"Failed to get OS information: {exc}"}
 
@@ -63,7 +78,7 @@ def make_show_os_tool() -> Tool:
             "Show operating system information. "
             "Returns details about the current OS platform, version, and architecture."
         ),
-        parameters_schema=model_to_json_schema(ShowOSParams),
+        parameters_schema=_SHOW_OS_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=ShowOSParams,
@@ -77,6 +92,9 @@ class ShowHardwareParams(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+_SHOW_HARDWARE_SCHEMA = model_to_json_schema(ShowHardwareParams)
+
+
 class ShowHardwareResult(BaseModel):
     cpu_count: int
     cpu_count_logical: int
@@ -85,51 +103,68 @@ class ShowHardwareResult(BaseModel):
     system_info: Dict[str, Any]
 
 
+def _static_hardware_info() -> dict:
+    """Return the show_hardware fields that are fixed for the host's uptime."""
+    # CPU information
+    cpu_count = multiprocessing.cpu_count()
+    cpu_logical = os.cpu_count()
+
+    # Total memory in MB (limited on some platforms)
+    memory_total = None
+    try:
+        if _PAGE_SIZE is not None:
+            memory_total = _PAGE_SIZE * os.sysconf('SC_PHYS_PAGES') >> 20  # bytes to MB
+    except (OSError, AttributeError, ValueError):
+        # Memory info not available on this platform
+        pass
+
+    # System information. platform.architecture() runs `file` on the
+    # interpreter binary, which is most of the cost of a show_hardware call.
+    system_info = {
+        "platform": platform.platform(),
+        "architecture": platform.architecture(),
+        "uname": list(platform.uname()) if hasattr(platform, 'uname') else None,
+    }
+
+    return {
+        "cpu_count": cpu_count or 0,
+        "cpu_count_logical": cpu_logical or cpu_count or 0,
+        "memory_total_mb": memory_total,
+        "system_info": system_info,
+    }
+
+
+def _available_memory_mb() -> int | None:
+    """Return currently available memory in MB, or None where unsupported."""
+    try:
+        if _PAGE_SIZE is not None:
+            # Available memory (approximate)
+            return _PAGE_SIZE * os.sysconf('SC_AVPHYS_PAGES') >> 20  # bytes to MB
+    except (OSError, AttributeError, ValueError):
+        # Memory info not available on this platform
+        pass
+    return None
+
+
 def make_show_hardware_tool() -> Tool:
     """
     Return a show_hardware Tool that returns basic hardware information.
 
     Uses built-in modules to gather CPU and memory information where available.
     Note: Detailed hardware monitoring requires psutil (not included).
+
+    Everything except available memory is looked up on the first successful
+    call and reused; available memory is read fresh every time.
     """
+    static: dict = {}
 
     def execute(params: dict) -> dict:
         try:
-            # CPU information
-            cpu_count = multiprocessing.cpu_count()
-            cpu_logical = os.cpu_count()
-
-            # Memory information (limited on some platforms)
-            memory_total = None
-            memory_available = None
-
-            # Try to get memory info using os.sysconf (Unix-like systems)
-            try:
-                if hasattr(os, 'sysconf'):
-                    # Total memory in bytes
-                    total_bytes = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
-                    memory_total = total_bytes // (1024 * 1024)  # Convert to MB
-
-                    # Available memory (approximate)
-                    avail_bytes = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_AVPHYS_PAGES')
-                    memory_available = avail_bytes // (1024 * 1024)  # Convert to MB
-            except (OSError, AttributeError):
-                # Memory info not available on this platform
-                pass
-
-            # System information
-            system_info = {
-                "platform": platform.platform(),
-                "architecture": platform.architecture(),
-                "uname": list(platform.uname()) if hasattr(platform, 'uname') else None,
-            }
-
+            if not static:
+                static.update(_static_hardware_info())
             return ShowHardwareResult(
-                cpu_count=cpu_count or 0,
-                cpu_count_logical=cpu_logical or cpu_count or 0,
-                memory_total_mb=memory_total,
-                memory_available_mb=memory_available,
-                system_info=system_info,
+                **static,
+                memory_available_mb=_available_memory_mb(),
             ).model_dump()
         except Exception as exc:
             return {"error": f"Failed to get hardware information: {exc}"}
@@ -140,7 +175,7 @@ def make_show_hardware_tool() -> Tool:
             "Return basic hardware information including CPU count, memory details, "
             "and system architecture. Note: Detailed hardware monitoring requires psutil."
         ),
-        parameters_schema=model_to_json_schema(ShowHardwareParams),
+        parameters_schema=_SHOW_HARDWARE_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=ShowHardwareParams,
@@ -154,6 +189,9 @@ class ShowPSParams(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+_SHOW_PS_SCHEMA = model_to_json_schema(ShowPSParams)
+
+
 class ShowPSResult(BaseModel):
     current_process: Dict[str, Any]
     parent_process: Dict[str, Any] | None
@@ -218,7 +256,7 @@ def make_show_ps_tool() -> Tool:
             "Return basic process information for the current process and system. "
             "Note: Full process listing and detailed process information requires psutil."
         ),
-        parameters_schema=model_to_json_schema(ShowPSParams),
+        parameters_schema=_SHOW_PS_SCHEMA,
         risk_level="low",
         _execute=execute,
         params_model=ShowPSParams,
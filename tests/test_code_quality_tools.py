@@ -2,18 +2,32 @@
 # Covers:
 #   - check_syntax on a valid Python file → valid=True
 #   - check_syntax on a file with a syntax error → valid=False
+#   - check_syntax reuses one worker process and restarts it if it dies
+#   - check_syntax writes no .pyc files
 #   - lint on a clean file → passed=True (ruff mocked)
 #   - lint falls back to flake8 when ruff is not found (both mocked)
 #   - lint returns error dict when neither linter is available
 #   - lint with a non-existent path returns an error dict (not a raised exception)
+#   - lint parses ruff's JSON report into structured diagnostics
+#   - lint reuses results for unchanged files, never for fix=True
+#   - a same-size rewrite with the old mtime still invalidates the lint cache
+#   - the lint cache follows the real path across chdir and notices config edits
+#   - cached diagnostics are not shared between callers
 #   - All tools return dicts, never raise
 
+import json
+import os
 import subprocess
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from orchestrator.tools.code_quality import make_check_syntax_tool, make_lint_tool
+from orchestrator.tools.code_quality import (
+    _CompileWorker,
+    make_check_syntax_tool,
+    make_lint_tool,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -74,27 +88,63 @@ def test_check_syntax_nonexistent_file():
     tool = make_check_syntax_tool()
     result = tool.execute({"path": "/nonexistent/path/file.py"})
     assert isinstance(result, dict)
-    # py_compile exits non-zero on a missing file; valid must not be True.
+    # The compile worker reports a missing file as returncode 1; valid must not be True.
     assert result.get("valid") is not True
 
 
+def test_check_syntax_reuses_and_restarts_worker(valid_py_file, invalid_py_file):
+    """One worker serves every call; a dead worker is replaced on the next call."""
+    started = []
+    real_start = _CompileWorker._start
+
+    def tracking_start(self):
+        real_start(self)
+        started.append(self._proc)
+
+    with patch.object(_CompileWorker, "_start", tracking_start):
+        tool = make_check_syntax_tool()
+        assert tool.execute({"path": valid_py_file})["valid"] is True
+        assert tool.execute({"path": invalid_py_file})["valid"] is False
+        assert len(started) == 1
+
+        started[0].kill()
+        started[0].wait()
+        assert tool.execute({"path": valid_py_file})["valid"] is True
+        assert len(started) == 2
+    started[1].kill()
+
+
+def test_check_syntax_writes_no_bytecode(valid_py_file, tmp_path):
+    make_check_syntax_tool().execute({"path": valid_py_file})
+    assert not (tmp_path / "__pycache__").exists()
+
+
 # ---------------------------------------------------------------------------
 # lint — mocked subprocess so tests are hermetic regardless of installed tools
 # ---------------------------------------------------------------------------
 
-def _mock_proc(returncode: int, stdout: str = "", stderr: str = "") -> MagicMock:
-    """Build a mock CompletedProcess-like object."""
-    proc = MagicMock()
-    proc.returncode = returncode
-    proc.stdout = stdout
-    proc.stderr = stderr
-    return proc
+def _fake_run(returncode: int, stdout: str = "", stderr: str = ""):
+    """
+    Build a subprocess.run side effect that writes the given output.
+
+    The tools redirect output to temp files, so the fake writes into the
+    file objects passed as stdout=/stderr= rather than returning strings.
+    """
+
+    def run(cmd, **kwargs):
+        kwargs["stdout"].write(stdout.encode("utf-8"))
+        kwargs["stderr"].write(stderr.encode("utf-8"))
+        proc = MagicMock()
+        proc.returncode = returncode
+        return proc
+
+    return run
 
 
 def test_lint_clean_file_passes(valid_py_file):
     """lint returns passed=True when ruff reports no issues."""
     tool = make_lint_tool()
-    with patch("orchestrator.tools.code_quality.subprocess.run", return_value=_mock_proc(0)) as mock_run:
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(0)) as mock_run:
         result = tool.execute({"path": valid_py_file})
     assert isinstance(result, dict)
     assert result.get("passed") is True
@@ -105,7 +155,7 @@ def test_lint_clean_file_passes(valid_py_file):
 def test_lint_issues_found_fails(valid_py_file):
     """lint returns passed=False when ruff reports issues (non-zero exit)."""
     tool = make_lint_tool()
-    with patch("orchestrator.tools.code_quality.subprocess.run", return_value=_mock_proc(1, stdout="E501 line too long")):
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(1, stdout="E501 line too long")):
         result = tool.execute({"path": valid_py_file})
     assert result.get("passed") is False
     assert result.get("tool_used") == "ruff"
@@ -118,7 +168,7 @@ def test_lint_falls_back_to_flake8_when_ruff_missing(valid_py_file):
     def side_effect(cmd, **kwargs):
         if cmd[0] == "ruff":
             raise FileNotFoundError
-        return _mock_proc(0)
+        return _fake_run(0)(cmd, **kwargs)
 
     with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=side_effect):
         result = tool.execute({"path": valid_py_file})
@@ -138,7 +188,7 @@ def test_lint_error_dict_when_no_linter_available(valid_py_file):
 def test_lint_nonexistent_path_returns_dict():
     """lint with a non-existent path returns a dict — either an error or a linter report."""
     tool = make_lint_tool()
-    with patch("orchestrator.tools.code_quality.subprocess.run", return_value=_mock_proc(1, stderr="No such file")):
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(1, stderr="No such file")):
         result = tool.execute({"path": "/nonexistent/path"})
     assert isinstance(result, dict)
 
@@ -146,7 +196,7 @@ def test_lint_nonexistent_path_returns_dict():
 def test_lint_result_is_dict_not_exception(valid_py_file):
     """lint never raises — always returns a dict."""
     tool = make_lint_tool()
-    with patch("orchestrator.tools.code_quality.subprocess.run", return_value=_mock_proc(0)):
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(0)):
         try:
             result = tool.execute({"path": valid_py_file})
             assert isinstance(result, dict)
@@ -154,10 +204,146 @@ def test_lint_result_is_dict_not_exception(valid_py_file):
             pytest.fail(f"lint raised instead of returning a dict: {exc}")
 
 
+def test_lint_parses_ruff_json_into_diagnostics(valid_py_file):
+    """ruff's JSON report is returned as compact structured diagnostics."""
+    report = json.dumps([
+        {
+            "code": "F401",
+            "message": "`os` imported but unused",
+            "filename": valid_py_file,
+            "location": {"row": 1, "column": 8},
+            "end_location": {"row": 1, "column": 10},
+            "fix": {"applicability": "safe", "edits": [], "message": "Remove unused import"},
+            "url": "https://docs.astral.sh/ruff/rules/unused-import",
+        }
+    ])
+    tool = make_lint_tool()
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(1, stdout=report)) as mock_run:
+        result = tool.execute({"path": valid_py_file})
+    assert "--output-format=json" in mock_run.call_args[0][0]
+    assert result["stdout"] == ""
+    assert result["diagnostics"] == [
+        {
+            "code": "F401",
+            "message": "`os` imported but unused",
+            "filename": valid_py_file,
+            "row": 1,
+            "column": 8,
+            "fixable": True,
+        }
+    ]
+
+
+def test_lint_keeps_non_json_stdout(valid_py_file):
+    """Output that is not a JSON report is passed through in stdout."""
+    tool = make_lint_tool()
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(2, stdout="ruff failed")):
+        result = tool.execute({"path": valid_py_file})
+    assert result["stdout"] == "ruff failed"
+    assert result["diagnostics"] == []
+
+
 def test_lint_fix_flag_passed_to_ruff(valid_py_file):
     """When fix=True, --fix is appended to the ruff command."""
     tool = make_lint_tool()
-    with patch("orchestrator.tools.code_quality.subprocess.run", return_value=_mock_proc(0)) as mock_run:
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(0)) as mock_run:
         tool.execute({"path": valid_py_file, "fix": True})
     args = mock_run.call_args[0][0]
     assert "--fix" in args
+
+
+def test_lint_reuses_result_for_unchanged_file(valid_py_file):
+    """A second lint of an unchanged file is served without running ruff again."""
+    tool = make_lint_tool()
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(0)) as mock_run:
+        first = tool.execute({"path": valid_py_file})
+        second = tool.execute({"path": valid_py_file})
+    assert first == second
+    mock_run.assert_called_once()
+
+
+def test_lint_reruns_after_file_changes(valid_py_file):
+    """Editing the file invalidates the remembered lint result."""
+    tool = make_lint_tool()
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(0)) as mock_run:
+        tool.execute({"path": valid_py_file})
+        with open(valid_py_file, "a") as f:
+            f.write("y = 3\n")
+        st = os.stat(valid_py_file)
+        os.utime(valid_py_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        tool.execute({"path": valid_py_file})
+    assert mock_run.call_count == 2
+
+
+def test_lint_cache_keys_on_real_path(tmp_path, monkeypatch):
+    """The same relative path in another directory is a different file."""
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "mod.py").write_text("x = 1\n")
+    tool = make_lint_tool()
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(0)) as mock_run:
+        monkeypatch.chdir(tmp_path / "a")
+        tool.execute({"path": "mod.py"})
+        monkeypatch.chdir(tmp_path / "b")
+        tool.execute({"path": "mod.py"})
+        tool.execute({"path": str(tmp_path / "b" / "mod.py")})
+    assert mock_run.call_count == 2
+
+
+def test_lint_reruns_after_config_changes(valid_py_file, tmp_path):
+    """Creating or editing a linter config invalidates the remembered result."""
+    tool = make_lint_tool()
+    config = tmp_path / "ruff.toml"
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(0)) as mock_run:
+        tool.execute({"path": valid_py_file})
+        config.write_text("line-length = 100\n")
+        tool.execute({"path": valid_py_file})
+        config.write_text("line-length = 88\n")
+        tool.execute({"path": valid_py_file})
+        tool.execute({"path": valid_py_file})
+    assert mock_run.call_count == 3
+
+
+def test_lint_cached_diagnostics_are_not_shared(valid_py_file):
+    """A caller mutating its diagnostics does not change the cached copy."""
+    report = json.dumps([
+        {
+            "code": "F401",
+            "message": "`os` imported but unused",
+            "filename": valid_py_file,
+            "location": {"row": 1, "column": 8},
+            "fix": None,
+        }
+    ])
+    tool = make_lint_tool()
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(1, stdout=report)):
+        first = tool.execute({"path": valid_py_file})
+        first["diagnostics"][0]["code"] = "E999"
+        first["diagnostics"].clear()
+        second = tool.execute({"path": valid_py_file})
+    assert [d["code"] for d in second["diagnostics"]] == ["F401"]
+
+
+def test_lint_reruns_after_same_size_rewrite_with_old_mtime(valid_py_file):
+    """A same-size edit whose mtime is set back is still noticed (via ctime)."""
+    tool = make_lint_tool()
+    st = os.stat(valid_py_file)
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(0)) as mock_run:
+        tool.execute({"path": valid_py_file})
+        # Step past the coarse timestamp clock so the ctime can move.
+        time.sleep(0.05)
+        with open(valid_py_file, "w") as f:
+            f.write("x = 1 + 3\n")
+        os.utime(valid_py_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert os.stat(valid_py_file).st_size == st.st_size
+        tool.execute({"path": valid_py_file})
+    assert mock_run.call_count == 2
+
+
+def test_lint_fix_is_never_cached(valid_py_file):
+    """fix=True always runs the linter because it may rewrite the file."""
+    tool = make_lint_tool()
+    with patch("orchestrator.tools.code_quality.subprocess.run", side_effect=_fake_run(0)) as mock_run:
+        tool.execute({"path": valid_py_file, "fix": True})
+        tool.execute({"path": valid_py_file, "fix": True})
+    assert mock_run.call_count == 2
@@ -0,0 +1,196 @@
+# Purpose: Unit tests for tools/content_access.py (large piped content tools).
+# Covers:
+#   - set_large_content caches line-break offsets and the line count once
+#   - clear_large_content drops the content and every derived view
+#   - read_content_range returns the requested 1-indexed line range
+#   - read_content_range normalises mixed line endings like the join path
+#   - search_content returns matches with numbered context lines
+#   - get_content_info reports availability and sizes
+#   - tools return an error dict when no content is stored
+
+import pytest
+
+from orchestrator.tools import content_access
+from orchestrator.tools.content_access import (
+    clear_large_content,
+    get_large_line_count,
+    has_large_content,
+    make_get_content_info_tool,
+    make_read_content_range_tool,
+    make_search_content_tool,
+    set_large_content,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_store():
+    """Content is module-global; clear it around every test for isolation."""
+    clear_large_content()
+    yield
+    clear_large_content()
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "text", ["", "a", "a\n", "\n", "alpha\r\nbeta\rgamma\n\ndelta", "x\u2028y\r\n"]
+)
+def test_line_count_matches_splitlines(text):
+    set_large_content(text)
+    assert get_large_line_count() == len(text.splitlines())
+
+
+def test_lines_are_sliced_from_content():
+    """No per-line copy is stored; each line is sliced out on demand."""
+    text = "alpha\r\nbeta\rgamma\n\ndelta"
+    set_large_content(text)
+    lines = [content_access._line(i) for i in range(get_large_line_count())]
+    assert lines == text.splitlines()
+
+
+def test_newline_offsets_mark_line_ends():
+    """Each offset is the index at which the corresponding line ends."""
+    text = "ab\r\ncd\nef"
+    set_large_content(text)
+    offsets = list(content_access._large_newline_offsets)
+    assert offsets == [2, 6]
+    assert text[:offsets[0]] == "ab"
+
+
+def test_clear_large_content_drops_everything():
+    set_large_content("one\ntwo")
+    clear_large_content()
+    assert not has_large_content()
+    assert get_large_line_count() == 0
+    assert content_access._large_newline_offsets is None
+
+
+# ---------------------------------------------------------------------------
+# read_content_range
+# ---------------------------------------------------------------------------
+
+def test_read_content_range_returns_lines():
+    set_large_content("l1\nl2\nl3\nl4\n")
+    result = make_read_content_range_tool().execute({"start_line": 2, "end_line": 3})
+    assert result["content"] == "l2\nl3"
+    assert result["start_line"] == 2
+    assert result["end_line"] == 3
+    assert result["total_lines"] == 4
+    assert result["truncated"] is False
+
+
+def test_read_content_range_truncates_to_max_chars():
+    set_large_content("x" * 100)
+    result = make_read_content_range_tool().execute({"start_line": 1, "max_chars": 10})
+    assert result["content"] == "x" * 10
+    assert result["truncated"] is True
+
+
+def test_read_content_range_slices_lf_content():
+    """LF-only content is served as a direct slice of the stored string."""
+    set_large_content("l1\nl2\nl3\nl4\n")
+    assert content_access._large_lf_only is True
+    result = make_read_content_range_tool().execute(
+        {"start_line": 2, "end_line": 4, "max_chars": 4}
+    )
+    assert result["content"] == "l2\nl"
+    assert result["truncated"] is True
+
+
+def test_read_content_range_normalises_mixed_line_endings():
+    set_large_content("a\r\nb\rc\nd")
+    assert content_access._large_lf_only is False
+    result = make_read_content_range_tool().execute({"start_line": 1})
+    assert result["content"] == "a\nb\nc\nd"
+
+
+def test_read_content_range_start_past_end_returns_error():
+    set_large_content("only line")
+    result = make_read_content_range_tool().execute({"start_line": 5})
+    assert "error" in result
+
+
+def test_read_content_range_without_content_returns_error():
+    result = make_read_content_range_tool().execute({"start_line": 1})
+    assert "error" in result
+
+
+# ---------------------------------------------------------------------------
+# search_content
+# ---------------------------------------------------------------------------
+
+def test_search_content_marks_matching_line():
+    set_large_content("a\nb\nneedle here\nc\nd")
+    result = make_search_content_tool().execute({"pattern": "needle", "context_lines": 1})
+    assert result["total_matches"] == 1
+    match = result["matches"][0]
+    assert match["line_number"] == 3
+    assert match["content"] == (
+        "       2: b\n"
+        ">>>    3: needle here\n"
+        "       4: c"
+    )
+
+
+def test_search_content_after_new_content_uses_new_lines():
+    tool = make_search_content_tool()
+    set_large_content("old needle")
+    tool.execute({"pattern": "needle"})
+    set_large_content("new needle")
+    result = tool.execute({"pattern": "needle", "context_lines": 0})
+    assert result["matches"][0]["content"] == ">>>    1: new needle"
+
+
+def test_search_content_reports_each_line_once():
+    """Several hits on one line produce a single match for that line."""
+    set_large_content("x x x\ny\nx")
+    result = make_search_content_tool().execute({"pattern": "x", "context_lines": 0})
+    assert [m["line_number"] for m in result["matches"]] == [1, 3]
+
+
+def test_search_content_ignores_matches_across_line_breaks():
+    """Matching is per line: a pattern spanning a CRLF boundary is not a hit."""
+    set_large_content("ab\r\ncd\r\nabcd")
+    result = make_search_content_tool().execute({"pattern": "b\r\nc"})
+    assert result["matches"] == []
+    result = make_search_content_tool().execute({"pattern": "bc", "context_lines": 0})
+    assert [m["line_number"] for m in result["matches"]] == [3]
+
+
+def test_search_content_respects_max_results():
+    set_large_content("\n".join(["hit"] * 20))
+    result = make_search_content_tool().execute({"pattern": "hit", "max_results": 5})
+    assert result["total_matches"] == 5
+    assert result["truncated"] is True
+
+
+def test_search_content_without_content_returns_error():
+    result = make_search_content_tool().execute({"pattern": "x"})
+    assert "error" in result
+
+
+# ---------------------------------------------------------------------------
+# get_content_info
+# ---------------------------------------------------------------------------
+
+def test_get_content_info_without_content():
+    result = make_get_content_info_tool().execute({})
+    assert result == {
+        "available": False,
+        "total_lines": None,
+        "total_chars": None,
+        "estimated_tokens": None,
+    }
+
+
+def test_get_content_info_reports_sizes():
+    set_large_content("abcd\nefgh\n")
+    result = make_get_content_info_tool().execute({})
+    assert result == {
+        "available": True,
+        "total_lines": 2,
+        "total_chars": 10,
+        "estimated_tokens": 2,
+    }
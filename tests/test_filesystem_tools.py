@@ -0,0 +1,324 @@
+# Purpose: Unit tests for tools/filesystem.py (read_file, write_file,
+#          list_directory and the _allowed_real_path path check).
+# Covers:
+#   - paths inside an allowed root are accepted
+#   - directory traversal out of the root is rejected
+#   - a sibling directory sharing the root's name prefix is rejected
+#   - a symlink inside the root that points outside it is rejected
+#   - a symlink planted inside the root is rejected even if it points inside;
+#     a root reached through a symlink is still accepted and usable by every tool
+#   - a planted symlink spelled with a trailing "/" or "/." is still rejected
+#   - every tool refuses to go through a symlinked parent inside the root
+#   - files are opened with O_NOFOLLOW, so a final component swapped for a link fails
+#   - list_directory says whether a path is missing, not a directory, or a symlink
+#   - several roots (including nested and filesystem-root entries) are matched correctly
+#   - each tool returns an error dict for paths outside the allowlist
+#   - read_files reports per-path results without failing the whole batch
+#   - files over the read size limit are refused with an error dict
+#   - write_file reports bytes_written as the UTF-8 byte count
+
+import os
+
+import pytest
+
+from orchestrator.tools import filesystem
+from orchestrator.tools.filesystem import (
+    _allowed_real_path,
+    _read_text_utf8,
+    _resolve_allowed,
+    _write_bytes,
+    make_list_directory_tool,
+    make_read_file_tool,
+    make_read_files_tool,
+    make_write_file_tool,
+)
+
+
+@pytest.fixture()
+def root(tmp_path):
+    """An allowed root directory containing one file, next to a sibling dir."""
+    allowed = tmp_path / "allowed"
+    allowed.mkdir()
+    (allowed / "hello.txt").write_text("hello\n", encoding="utf-8")
+    (tmp_path / "allowed_sibling").mkdir()
+    (tmp_path / "allowed_sibling" / "secret.txt").write_text("secret", encoding="utf-8")
+    return allowed
+
+
+# ---------------------------------------------------------------------------
+# _allowed_real_path
+# ---------------------------------------------------------------------------
+
+def test_allowed_real_path_accepts_path_inside_root(root):
+    assert _allowed_real_path(str(root / "hello.txt"), _resolve_allowed([str(root)]))
+
+
+def test_allowed_real_path_accepts_root_itself(root):
+    assert _allowed_real_path(str(root), _resolve_allowed([str(root)]))
+
+
+def test_allowed_real_path_rejects_traversal(root):
+    path = str(root / ".." / "allowed_sibling" / "secret.txt")
+    assert not _allowed_real_path(path, _resolve_allowed([str(root)]))
+
+
+def test_allowed_real_path_rejects_name_prefix_sibling(root):
+    """'/x/allowed_sibling' must not pass as being inside '/x/allowed'."""
+    path = str(root.parent / "allowed_sibling" / "secret.txt")
+    assert not _allowed_real_path(path, _resolve_allowed([str(root)]))
+
+
+def test_allowed_real_path_rejects_symlink_escape(root):
+    link = root / "escape"
+    os.symlink(root.parent / "allowed_sibling", link)
+    assert not _allowed_real_path(str(link / "secret.txt"), _resolve_allowed([str(root)]))
+
+
+def test_allowed_real_path_rejects_symlink_inside_root(root):
+    """Links in the tree are refused even when they currently point inside it."""
+    os.symlink(root / "hello.txt", root / "alias.txt")
+    assert not _allowed_real_path(str(root / "alias.txt"), _resolve_allowed([str(root)]))
+
+
+def test_allowed_real_path_accepts_root_reached_through_symlink(root, tmp_path):
+    link = tmp_path / "root_link"
+    os.symlink(root, link)
+    allowed = _resolve_allowed([str(link)])
+    assert _allowed_real_path(str(link), allowed) == str(root)
+    assert _allowed_real_path(str(link / "hello.txt"), allowed) == str(root / "hello.txt")
+
+
+def test_tools_work_on_root_reached_through_symlink(root, tmp_path):
+    """The tools open the resolved path, so O_NOFOLLOW does not trip on the root link."""
+    link = tmp_path / "root_link"
+    os.symlink(root, link)
+    allowed = [str(link)]
+    listing = make_list_directory_tool(allowed).execute({"path": str(link)})
+    assert listing == {"path": str(link), "entries": [{"name": "hello.txt", "type": "file"}]}
+    read = make_read_file_tool(allowed).execute({"path": str(link / "hello.txt")})
+    assert read == {"content": "hello\n", "path": str(link / "hello.txt")}
+    written = make_write_file_tool(allowed).execute({"path": str(link / "new.txt"), "content": "x"})
+    assert written["success"] is True
+    assert (root / "new.txt").read_text(encoding="utf-8") == "x"
+
+
+def test_file_as_root_reached_through_symlink(root, tmp_path):
+    link = tmp_path / "hello_link"
+    os.symlink(root / "hello.txt", link)
+    result = make_read_file_tool([str(link)]).execute({"path": str(link)})
+    assert result["content"] == "hello\n"
+
+
+def test_write_file_through_symlinked_parent_returns_error(root):
+    (root / "real").mkdir()
+    os.symlink(root / "real", root / "linked")
+    result = make_write_file_tool([str(root)]).execute(
+        {"path": str(root / "linked" / "new.txt"), "content": "x"}
+    )
+    assert "error" in result
+    assert not (root / "real" / "new.txt").exists()
+
+
+@pytest.mark.parametrize("suffix", ["/", "/.", "//", "/./"])
+def test_allowed_real_path_rejects_symlinked_dir_with_trailing_separator(root, suffix):
+    """lstat() follows a link named with a trailing slash; the walk must not."""
+    (root / "real").mkdir()
+    os.symlink(root / "real", root / "linkdir")
+    assert not _allowed_real_path(str(root / "linkdir") + suffix, _resolve_allowed([str(root)]))
+    result = make_list_directory_tool([str(root)]).execute(
+        {"path": str(root / "linkdir") + suffix}
+    )
+    assert "error" in result
+
+
+def test_allowed_real_path_rejects_symlink_traversed_then_left(root):
+    """'linkdir/..' is checked as written, not collapsed to the root first."""
+    (root / "real").mkdir()
+    os.symlink(root / "real", root / "linkdir")
+    assert not _allowed_real_path(str(root / "linkdir" / ".." / "hello.txt"), _resolve_allowed([str(root)]))
+
+
+def test_read_through_symlinked_parent_returns_error(root):
+    (root / "real").mkdir()
+    (root / "real" / "f.txt").write_text("f", encoding="utf-8")
+    os.symlink(root / "real", root / "linkdir")
+    path = str(root / "linkdir" / "f.txt")
+    assert "error" in make_read_file_tool([str(root)]).execute({"path": path})
+    batch = make_read_files_tool([str(root)]).execute({"paths": [path]})
+    assert "error" in batch["files"][0]
+
+
+def test_open_does_not_follow_final_symlink(root, tmp_path):
+    """A link put in place after the check is refused by open() itself."""
+    link = tmp_path / "swapped"
+    os.symlink(root / "hello.txt", link)
+    with pytest.raises(OSError):
+        _read_text_utf8(str(link))
+    with pytest.raises(OSError):
+        _write_bytes(str(link), b"x")
+    assert (root / "hello.txt").read_text(encoding="utf-8") == "hello\n"
+
+
+def test_read_file_symlink_loop_returns_error(root, tmp_path):
+    """A symlink loop yields an error dict instead of escaping as RuntimeError."""
+    loop = tmp_path / "loop"
+    os.symlink(loop, loop)
+    result = make_read_file_tool([str(tmp_path)]).execute({"path": str(loop / "x")})
+    assert "error" in result
+
+
+def test_resolve_allowed_drops_nested_roots(root):
+    resolved = _resolve_allowed([str(root / "sub"), str(root), str(root.parent / "allowed_sibling")])
+    assert resolved == (str(root) + os.sep, str(root.parent / "allowed_sibling") + os.sep)
+
+
+def test_allowed_real_path_with_several_roots(root, tmp_path):
+    other = tmp_path / "other"
+    other.mkdir()
+    allowed = _resolve_allowed([str(other), str(root)])
+    assert _allowed_real_path(str(root / "hello.txt"), allowed)
+    assert _allowed_real_path(str(other / "x"), allowed)
+    assert not _allowed_real_path(str(tmp_path / "allowed_sibling" / "secret.txt"), allowed)
+    assert not _allowed_real_path(str(tmp_path), allowed)
+
+
+def test_allowed_real_path_filesystem_root_admits_everything(root):
+    assert _allowed_real_path(str(root / "hello.txt"), _resolve_allowed(["/"]))
+
+
+def test_allowed_real_path_with_empty_allowlist(root):
+    assert not _allowed_real_path(str(root / "hello.txt"), _resolve_allowed([]))
+
+
+# ---------------------------------------------------------------------------
+# Tools
+# ---------------------------------------------------------------------------
+
+def test_read_file_inside_root(root):
+    path = str(root / "hello.txt")
+    result = make_read_file_tool([str(root)]).execute({"path": path})
+    assert result == {"content": "hello\n", "path": path}
+
+
+def test_read_file_outside_root_returns_error(root):
+    path = str(root.parent / "allowed_sibling" / "secret.txt")
+    result = make_read_file_tool([str(root)]).execute({"path": path})
+    assert "error" in result
+
+
+def test_read_file_missing_returns_error(root):
+    result = make_read_file_tool([str(root)]).execute({"path": str(root / "nope.txt")})
+    assert "error" in result
+
+
+def test_write_file_creates_parents(root):
+    path = root / "sub" / "new.txt"
+    result = make_write_file_tool([str(root)]).execute(
+        {"path": str(path), "content": "data"}
+    )
+    assert result["success"] is True
+    assert path.read_text(encoding="utf-8") == "data"
+
+
+def test_write_file_counts_utf8_bytes(root):
+    path = root / "utf8.txt"
+    content = "héllo → wörld\n"
+    result = make_write_file_tool([str(root)]).execute({"path": str(path), "content": content})
+    assert result["bytes_written"] == len(content.encode("utf-8"))
+    assert path.read_bytes() == content.encode("utf-8")
+
+
+def test_write_file_truncates_existing_file(root):
+    path = root / "hello.txt"
+    make_write_file_tool([str(root)]).execute({"path": str(path), "content": "hi"})
+    assert path.read_text(encoding="utf-8") == "hi"
+
+
+def test_write_file_outside_root_returns_error(root):
+    path = str(root.parent / "allowed_sibling" / "new.txt")
+    result = make_write_file_tool([str(root)]).execute({"path": path, "content": "x"})
+    assert "error" in result
+
+
+def test_list_directory_sorts_dirs_first(root):
+    (root / "zdir").mkdir()
+    result = make_list_directory_tool([str(root)]).execute({"path": str(root)})
+    assert result["entries"] == [
+        {"name": "zdir", "type": "dir"},
+        {"name": "hello.txt", "type": "file"},
+    ]
+
+
+def test_list_directory_follows_symlinks(root):
+    """A symlink to a directory lists as a dir; a dangling one sorts with the dirs."""
+    (root / "real").mkdir()
+    os.symlink(root / "real", root / "link")
+    os.symlink(root / "missing", root / "dangling")
+    result = make_list_directory_tool([str(root)]).execute({"path": str(root)})
+    assert result["entries"] == [
+        {"name": "dangling", "type": "file"},
+        {"name": "link", "type": "dir"},
+        {"name": "real", "type": "dir"},
+        {"name": "hello.txt", "type": "file"},
+    ]
+
+
+def test_list_directory_missing_or_file_returns_error(root):
+    tool = make_list_directory_tool([str(root)])
+    assert tool.execute({"path": str(root / "missing")})["error"].startswith("No such directory")
+    assert tool.execute({"path": str(root / "hello.txt")})["error"].startswith("Not a directory")
+
+
+def test_list_directory_reports_symlink_swapped_in_after_check(root, monkeypatch):
+    """If the checked path has become a link by open time, say so."""
+    (root / "real").mkdir()
+    os.symlink(root / "real", root / "swapped")
+    monkeypatch.setattr(filesystem, "_allowed_real_path", lambda path, allowed: path)
+    result = make_list_directory_tool([str(root)]).execute({"path": str(root / "swapped")})
+    assert result["error"].startswith("Refusing to follow symlink")
+
+
+def test_list_directory_outside_root_returns_error(root):
+    result = make_list_directory_tool([str(root)]).execute({"path": str(root.parent)})
+    assert "error" in result
+
+
+def test_read_file_translates_newlines_like_read_text(root):
+    """CRLF and lone CR are normalised to LF, matching Path.read_text()."""
+    path = root / "crlf.txt"
+    path.write_bytes("a\r\nb\rc\né".encode("utf-8"))
+    result = make_read_file_tool([str(root)]).execute({"path": str(path)})
+    assert result["content"] == path.read_text(encoding="utf-8")
+
+
+def test_read_file_too_large_returns_error(root, monkeypatch):
+    monkeypatch.setattr("orchestrator.tools.filesystem._MAX_READ_BYTES", 4)
+    path = root / "big.txt"
+    path.write_text("12345", encoding="utf-8")
+    result = make_read_file_tool([str(root)]).execute({"path": str(path)})
+    assert "too large" in result["error"]
+    batch = make_read_files_tool([str(root)]).execute({"paths": [str(path)]})
+    assert "too large" in batch["files"][0]["error"]
+
+
+def test_read_file_directory_returns_error(root):
+    result = make_read_file_tool([str(root)]).execute({"path": str(root)})
+    assert "error" in result
+
+
+def test_read_files_reports_each_path(root):
+    """read_files returns one entry per path; failures do not sink the batch."""
+    good = str(root / "hello.txt")
+    missing = str(root / "missing.txt")
+    outside = str(root.parent / "allowed_sibling" / "secret.txt")
+    result = make_read_files_tool([str(root)]).execute({"paths": [good, missing, outside]})
+    files = result["files"]
+    assert [f["path"] for f in files] == [good, missing, outside]
+    assert files[0]["content"] == "hello\n"
+    assert "error" in files[1]
+    assert "error" in files[2]
+
+
+def test_read_files_rejects_empty_batch(root):
+    result = make_read_files_tool([str(root)]).execute({"paths": []})
+    assert "error" in result
@@ -0,0 +1,214 @@
+# Purpose: Unit tests for tools/git.py, run against a throwaway repository.
+# Covers:
+#   - git_status reports branch, short status and diff stat
+#   - read-only queries run with --no-optional-locks; writes do not
+#   - git_status degrades to returncode -1 when git cannot be started
+#   - the branch is parsed from `git status --branch` headers (tracking, unborn, detached)
+#   - git_add + git_commit stage and commit a file
+#   - git_list_branches lists branches and marks the current one
+#   - git_list_branches spells remote branches like `git branch -a`
+#   - git_list_branches drops the record cut by the capture limit and says so
+#   - git_log and git_diff return git's output
+#   - git_diff tolerates non-UTF-8 content and keeps leading whitespace
+#   - output past the capture limit is dropped and marked; timeouts kill git
+#   - git_log reuses its result until HEAD moves (commit, checkout, reset)
+
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from orchestrator.tools.git import (
+    _parse_branch_header,
+    make_git_add_tool,
+    make_git_commit_tool,
+    make_git_diff_tool,
+    make_git_list_branches_tool,
+    make_git_log_tool,
+    make_git_status_tool,
+)
+
+
+@pytest.fixture()
+def repo(tmp_path, monkeypatch):
+    """A git repository with one commit on branch 'main', used as the cwd."""
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    (tmp_path / "a.txt").write_text("one\n")
+    git("add", "a.txt")
+    git("commit", "-q", "-m", "initial")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_git_status_reports_changes(repo):
+    (repo / "a.txt").write_text("two\n")
+    (repo / "new.txt").write_text("x\n")
+    result = make_git_status_tool().execute({})
+    assert result["branch"] == "main"
+    assert "M a.txt" in result["status"]
+    assert "?? new.txt" in result["status"]
+    assert "a.txt" in result["diff_stat"]
+    assert result["returncode"] == 0
+
+
+@pytest.mark.parametrize(
+    "header, branch",
+    [
+        ("## main", "main"),
+        ("## main...origin/main [ahead 1, behind 2]", "main"),
+        ("## feature/x...origin/feature/x", "feature/x"),
+        ("## No commits yet on main", "main"),
+        ("## HEAD (no branch)", "HEAD"),
+        ("", ""),
+    ],
+)
+def test_parse_branch_header(header, branch):
+    assert _parse_branch_header(header) == branch
+
+
+def test_git_status_clean_and_detached(repo):
+    result = make_git_status_tool().execute({})
+    assert result["status"] == ""
+    subprocess.run(["git", "checkout", "-q", "--detach"], cwd=repo, check=True)
+    assert make_git_status_tool().execute({})["branch"] == "HEAD"
+
+
+def test_read_only_queries_skip_optional_locks(repo):
+    started = []
+    real_popen = subprocess.Popen
+
+    def spy(argv, **kwargs):
+        started.append(argv)
+        return real_popen(argv, **kwargs)
+
+    (repo / "b.txt").write_text("b\n")
+    with patch("orchestrator.tools.git.subprocess.Popen", side_effect=spy):
+        make_git_status_tool().execute({})
+        make_git_diff_tool().execute({})
+        make_git_log_tool().execute({})
+        make_git_list_branches_tool().execute({})
+        make_git_add_tool().execute({"paths": ["b.txt"]})
+    reads, add = started[:-1], started[-1]
+    assert len(reads) == 5
+    assert all(argv[1] == "--no-optional-locks" for argv in reads)
+    assert add[1] == "add"
+
+
+def test_git_status_without_git(repo):
+    with patch("orchestrator.tools.git.subprocess.Popen", side_effect=FileNotFoundError):
+        result = make_git_status_tool().execute({})
+    assert result == {"branch": "", "status": "", "diff_stat": "", "returncode": -1}
+
+
+def test_git_add_and_commit(repo):
+    (repo / "b.txt").write_text("b\n")
+    added = make_git_add_tool().execute({"paths": ["b.txt"]})
+    assert added["success"] is True
+    committed = make_git_commit_tool().execute({"message": "add b"})
+    assert committed["success"] is True
+    log = make_git_log_tool().execute({"n": 1})
+    assert log["log"].endswith("add b")
+
+
+def test_git_commit_with_nothing_staged_fails(repo):
+    result = make_git_commit_tool().execute({"message": "empty"})
+    assert result["success"] is False
+    assert result["returncode"] != 0
+
+
+def test_git_list_branches_marks_current(repo):
+    subprocess.run(["git", "branch", "feature"], cwd=repo, check=True)
+    result = make_git_list_branches_tool().execute({})
+    assert result["current"] == "main"
+    assert set(result["branches"]) == {"main", "feature"}
+
+
+def test_git_list_branches_includes_remotes(repo, tmp_path_factory, monkeypatch):
+    clone = tmp_path_factory.mktemp("clone") / "repo"
+    subprocess.run(["git", "clone", "-q", str(repo), str(clone)], check=True)
+    monkeypatch.chdir(clone)
+    result = make_git_list_branches_tool().execute({})
+    assert result["branches"] == [
+        "main",
+        "remotes/origin/HEAD -> origin/main",
+        "remotes/origin/main",
+    ]
+    assert result["current"] == "main"
+
+
+def test_git_list_branches_detached_head(repo):
+    subprocess.run(["git", "checkout", "-q", "--detach"], cwd=repo, check=True)
+    result = make_git_list_branches_tool().execute({})
+    assert result["branches"] == ["main"]
+    assert result["current"] == ""
+
+
+def test_git_list_branches_output_is_capped(repo, monkeypatch):
+    monkeypatch.setattr("orchestrator.tools.git._GIT_OUTPUT_LIMIT", 30)
+    subprocess.run(["git", "branch", "feature"], cwd=repo, check=True)
+    result = make_git_list_branches_tool().execute({})
+    assert result["returncode"] == 0
+    assert result["truncated"] is True
+    assert result["branches"] == ["feature"]
+    assert result["current"] == ""
+
+
+def test_git_log_cache_follows_head(repo):
+    tool = make_git_log_tool()
+    first = tool.execute({"n": 5})
+    with patch("orchestrator.tools.git.subprocess.Popen") as popen:
+        assert tool.execute({"n": 5}) == first
+    popen.assert_not_called()
+
+    (repo / "b.txt").write_text("b\n")
+    make_git_add_tool().execute({"paths": ["b.txt"]})
+    make_git_commit_tool().execute({"message": "second"})
+    assert tool.execute({"n": 5})["log"].splitlines()[0].endswith("second")
+
+    subprocess.run(["git", "reset", "-q", "--hard", "HEAD~1"], cwd=repo, check=True)
+    assert tool.execute({"n": 5}) == first
+
+    subprocess.run(["git", "checkout", "-q", "-b", "other"], cwd=repo, check=True)
+    subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", "on other"], cwd=repo, check=True)
+    assert tool.execute({"n": 5})["log"].splitlines()[0].endswith("on other")
+
+
+def test_git_diff_shows_working_tree_changes(repo):
+    (repo / "a.txt").write_text("two\n")
+    result = make_git_diff_tool().execute({})
+    assert "-one" in result["diff"]
+    assert "+two" in result["diff"]
+
+
+def test_git_diff_non_utf8_content(repo):
+    (repo / "a.txt").write_bytes(b"caf\xe9\n")
+    result = make_git_diff_tool().execute({})
+    assert result["returncode"] == 0
+    assert "+caf\ufffd" in result["diff"]
+
+
+def test_git_diff_output_is_capped(repo, monkeypatch):
+    monkeypatch.setattr("orchestrator.tools.git._GIT_OUTPUT_LIMIT", 10)
+    monkeypatch.setattr("orchestrator.tools.git._GIT_READ_CHUNK", 4)
+    (repo / "a.txt").write_text("two\n" * 1000)
+    result = make_git_diff_tool().execute({})
+    assert result["returncode"] == 0
+    assert result["diff"] == "diff --git\n[output truncated at 10 bytes]"
+
+
+def test_git_timeout_returns_error(repo, monkeypatch):
+    monkeypatch.setattr("orchestrator.tools.git._GIT_TIMEOUT", 0)
+    result = make_git_diff_tool().execute({})
+    assert result == {"diff": "", "returncode": -1}
+
+
+def test_git_status_diff_stat_keeps_leading_space(repo):
+    (repo / "a.txt").write_text("two\n")
+    result = make_git_status_tool().execute({})
+    assert result["diff_stat"].startswith(" a.txt")
@@ -4,8 +4,12 @@
 #   - params_model validation: invalid params return a structured error dict
 #   - extra properties forbidden by ConfigDict(extra='forbid')
 #   - result models produce the expected shape
+#   - every tool's execute() output round-trips through its result model
 #   - EventEnvelope catches malformed events at the adapter boundary
 
+import subprocess
+from unittest.mock import MagicMock, patch
+
 import pytest
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
@@ -13,25 +17,81 @@ from orchestrator.core.event_queue import EventEnvelope
 from orchestrator.tools.filesystem import (
     ReadFileParams,
     ReadFileResult,
+    ReadFilesResult,
     WriteFileParams,
     WriteFileResult,
     ListDirectoryParams,
     ListDirectoryResult,
+    make_list_directory_tool,
+    make_read_file_tool,
+    make_read_files_tool,
+    make_write_file_tool,
+)
+from orchestrator.tools.code_quality import (
+    CheckSyntaxParams,
+    CheckSyntaxResult,
+    LintParams,
+    LintResult,
+    make_check_syntax_tool,
+    make_lint_tool,
+)
+from orchestrator.tools.content_access import (
+    GetContentInfoResult,
+    ReadContentRangeResult,
+    SearchContentResult,
+    clear_large_content,
+    make_get_content_info_tool,
+    make_read_content_range_tool,
+    make_search_content_tool,
+    set_large_content,
 )
-from orchestrator.tools.code_quality import CheckSyntaxParams, LintParams
 from orchestrator.tools.git import (
     GitAddParams,
+    GitAddResult,
+    GitBranchResult,
     GitCommitParams,
     GitCommitResult,
     GitDiffParams,
+    GitDiffResult,
     GitListBranchesParams,
+    GitListBranchesResult,
     GitLogParams,
+    GitLogResult,
     GitRollbackParams,
+    GitRollbackResult,
     GitStatusParams,
+    GitStatusResult,
+    make_git_add_tool,
+    make_git_branch_tool,
+    make_git_commit_tool,
+    make_git_diff_tool,
+    make_git_list_branches_tool,
+    make_git_log_tool,
+    make_git_rollback_tool,
+    make_git_status_tool,
+)
+from orchestrator.tools.notify import (
+    NotifyUserParams,
+    NotifyUserResult,
+    make_notify_user_tool,
 )
-from orchestrator.tools.notify import NotifyUserParams, NotifyUserResult
 from orchestrator.tools.registry import Tool, ToolRegistry, model_to_json_schema
-from orchestrator.tools.shell import RunTestsParams, RunTestsResult, ShellRunParams
+from orchestrator.tools.shell import (
+    RunTestsParams,
+    RunTestsResult,
+    ShellRunParams,
+    ShellRunResult,
+    make_run_tests_tool,
+    make_shell_run_tool,
+)
+from orchestrator.tools.system import (
+    ShowHardwareResult,
+    ShowOSResult,
+    ShowPSResult,
+    make_show_hardware_tool,
+    make_show_os_tool,
+    make_show_ps_tool,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -174,6 +234,102 @@ def test_run_tests_result_shape():
     assert d["passed"] is True
 
 
+# ---------------------------------------------------------------------------
+# Tool results — every execute() output round-trips through its result model
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def workspace(tmp_path, monkeypatch):
+    """A git repository with one commit (the cwd) and stored large content."""
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    (tmp_path / "a.py").write_text("x = 1\n")
+    git("add", "a.py")
+    git("commit", "-q", "-m", "initial")
+    (tmp_path / "a.py").write_text("x = 2\n")
+    monkeypatch.chdir(tmp_path)
+    set_large_content("a\nneedle\nb")
+    yield tmp_path
+    clear_large_content()
+
+
+def _lint(ws):
+    with patch(
+        "orchestrator.tools.code_quality.subprocess.run",
+        side_effect=lambda cmd, **kwargs: MagicMock(returncode=0),
+    ):
+        return make_lint_tool().execute({"path": str(ws / "a.py")})
+
+
+def _run_tests(ws):
+    completed = subprocess.CompletedProcess([], 0, stdout=".", stderr="")
+    with patch("orchestrator.tools.shell.subprocess.run", return_value=completed):
+        return make_run_tests_tool().execute({})
+
+
+_TOOL_RESULTS = [
+    ("read_file", ReadFileResult,
+     lambda ws: make_read_file_tool([str(ws)]).execute({"path": str(ws / "a.py")})),
+    ("read_files", ReadFilesResult,
+     lambda ws: make_read_files_tool([str(ws)]).execute({"paths": [str(ws / "a.py")]})),
+    ("write_file", WriteFileResult,
+     lambda ws: make_write_file_tool([str(ws)]).execute({"path": str(ws / "b.py"), "content": "y"})),
+    ("list_directory", ListDirectoryResult,
+     lambda ws: make_list_directory_tool([str(ws)]).execute({"path": str(ws)})),
+    ("git_status", GitStatusResult, lambda ws: make_git_status_tool().execute({})),
+    ("git_add", GitAddResult, lambda ws: make_git_add_tool().execute({"paths": ["a.py"]})),
+    ("git_commit", GitCommitResult,
+     lambda ws: make_git_commit_tool().execute({"message": "m"})),
+    ("git_branch", GitBranchResult,
+     lambda ws: make_git_branch_tool().execute({"name": "feature", "create": True})),
+    ("git_rollback", GitRollbackResult,
+     lambda ws: make_git_rollback_tool().execute({"to_commit": "HEAD", "reason": "r"})),
+    ("git_diff", GitDiffResult, lambda ws: make_git_diff_tool().execute({})),
+    ("git_list_branches", GitListBranchesResult,
+     lambda ws: make_git_list_branches_tool().execute({})),
+    ("git_log", GitLogResult, lambda ws: make_git_log_tool().execute({})),
+    ("read_content_range", ReadContentRangeResult,
+     lambda ws: make_read_content_range_tool().execute({"start_line": 1})),
+    ("search_content", SearchContentResult,
+     lambda ws: make_search_content_tool().execute({"pattern": "needle"})),
+    ("get_content_info", GetContentInfoResult,
+     lambda ws: make_get_content_info_tool().execute({})),
+    ("lint", LintResult, _lint),
+    ("check_syntax", CheckSyntaxResult,
+     lambda ws: make_check_syntax_tool().execute({"path": str(ws / "a.py")})),
+    ("shell_run", ShellRunResult,
+     lambda ws: make_shell_run_tool(["echo"]).execute({"command": ["echo", "hi"]})),
+    ("run_tests", RunTestsResult, _run_tests),
+    ("notify_user", NotifyUserResult,
+     lambda ws: make_notify_user_tool().execute({"message": "done"})),
+    ("show_os", ShowOSResult, lambda ws: make_show_os_tool().execute({})),
+    ("show_hardware", ShowHardwareResult, lambda ws: make_show_hardware_tool().execute({})),
+    ("show_ps", ShowPSResult, lambda ws: make_show_ps_tool().execute({})),
+]
+
+
+@pytest.mark.parametrize(
+    "result_model, run", [case[1:] for case in _TOOL_RESULTS], ids=[case[0] for case in _TOOL_RESULTS]
+)
+def test_tool_result_matches_result_model(workspace, result_model, run):
+    """
+    A successful execute() returns exactly what its result model would dump.
+
+    Many tools build their result dicts by hand instead of dumping the model
+    (see ARCHITECTURE.md), so this is what keeps the two in step. Dumping
+    drops undeclared keys, nested ones included, so the equality catches
+    those as well as missing or mistyped fields.
+    """
+    result = run(workspace)
+    assert "error" not in result
+    assert result_model.model_validate(result).model_dump() == result
+
+
 # ---------------------------------------------------------------------------
 # Params model validation — spot checks on migrated tools
 # ---------------------------------------------------------------------------
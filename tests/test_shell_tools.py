@@ -0,0 +1,100 @@
+# Purpose: Unit tests for tools/shell.py (the shell_run allowlist).
+# Covers:
+#   - allowlisted commands run and return stdout, stderr, returncode
+#   - commands outside the allowlist are refused with an error dict
+#   - the allowlist is fixed when the tool is built
+#   - run_tests is serial by default and shards with xdist when asked
+#   - run_tests falls back to a serial run (with a note) without spare CPUs
+#   - run_tests reruns serially, once and for later calls, when pytest rejects -n
+
+import subprocess
+import sys
+from unittest.mock import patch
+
+from orchestrator.tools import shell
+from orchestrator.tools.shell import (
+    RunTestsResult,
+    ShellRunResult,
+    make_run_tests_tool,
+    make_shell_run_tool,
+)
+
+
+def test_allowlisted_command_runs():
+    tool = make_shell_run_tool([sys.executable])
+    result = tool.execute({"command": [sys.executable, "-c", "print('hi')"]})
+    assert result == {"stdout": "hi\n", "stderr": "", "returncode": 0}
+    assert set(result) == set(ShellRunResult.model_fields)
+
+
+def test_command_outside_allowlist_is_refused():
+    tool = make_shell_run_tool(["git"])
+    result = tool.execute({"command": "rm -rf /"})
+    assert "not in the shell allowlist" in result["error"]
+
+
+def test_allowlist_is_copied_at_construction():
+    allowlist = ["git"]
+    tool = make_shell_run_tool(allowlist)
+    allowlist.append(sys.executable)
+    result = tool.execute({"command": [sys.executable, "-c", "pass"]})
+    assert "error" in result
+
+
+# ---------------------------------------------------------------------------
+# run_tests
+# ---------------------------------------------------------------------------
+
+def _run_tests_command(monkeypatch, workers, params):
+    """Build run_tests with a given xdist worker count; return the argv it runs."""
+    monkeypatch.setattr(shell, "_xdist_workers", lambda: workers)
+    completed = subprocess.CompletedProcess([], 0, stdout="ok", stderr="")
+    with patch("orchestrator.tools.shell.subprocess.run", return_value=completed) as run:
+        result = make_run_tests_tool().execute(params)
+    return run.call_args.args[0], result
+
+
+def test_run_tests_is_serial_by_default(monkeypatch):
+    command, result = _run_tests_command(monkeypatch, 6, {"path": "tests"})
+    assert command == ["pytest", "tests"]
+    assert result["passed"] is True
+
+
+def test_run_tests_parallel_shards_across_workers(monkeypatch):
+    command, result = _run_tests_command(monkeypatch, 6, {"parallel": True})
+    assert command == ["pytest", "-n", "6"]
+    assert result["stderr"] == ""
+
+
+def test_run_tests_parallel_without_spare_cpus_runs_serially(monkeypatch):
+    command, result = _run_tests_command(monkeypatch, 0, {"parallel": True})
+    assert command == ["pytest"]
+    assert "ran serially" in result["stderr"]
+    assert set(result) == set(RunTestsResult.model_fields)
+
+
+def test_run_tests_parallel_reruns_serially_when_pytest_lacks_xdist(monkeypatch):
+    monkeypatch.setattr(shell, "_xdist_workers", lambda: 6)
+    rejected = subprocess.CompletedProcess(
+        [], 4, stdout="", stderr="pytest: error: unrecognized arguments: -n\n"
+    )
+    completed = subprocess.CompletedProcess([], 0, stdout="ok", stderr="")
+    tool = make_run_tests_tool()
+    with patch(
+        "orchestrator.tools.shell.subprocess.run", side_effect=[rejected, completed, completed]
+    ) as run:
+        result = tool.execute({"parallel": True})
+        again = tool.execute({"parallel": True})
+    commands = [call.args[0] for call in run.call_args_list]
+    # The second request goes straight to a serial run.
+    assert commands == [["pytest", "-n", "6"], ["pytest"], ["pytest"]]
+    assert result["passed"] is True
+    assert "ran serially" in result["stderr"]
+    assert "ran serially" in again["stderr"]
+
+
+def test_xdist_workers_leaves_cpus_free(monkeypatch):
+    monkeypatch.setattr(shell.os, "cpu_count", lambda: 8)
+    assert shell._xdist_workers() == 6
+    monkeypatch.setattr(shell.os, "cpu_count", lambda: 3)
+    assert shell._xdist_workers() == 0
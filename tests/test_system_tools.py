@@ -47,6 +47,17 @@ class TestShowOSTool:
             assert "error" in result
             assert "Failed to get OS information" in result["error"]
 
+    def test_show_os_reuses_first_result(self):
+        """Host details are looked up once; later calls return a copy."""
+        tool = make_show_os_tool()
+        first = tool.execute({})
+
+        with patch('platform.system', side_effect=Exception("Platform error")):
+            second = tool.execute({})
+
+        assert second == first
+        assert second is not first
+
 
 class TestShowHardwareTool:
     """Test the show_hardware tool."""
@@ -91,6 +102,20 @@ class TestShowHardwareTool:
             assert "error" in result
             assert "Failed to get hardware information" in result["error"]
 
+    def test_show_hardware_caches_static_info(self):
+        """Static details are gathered once; available memory is re-read."""
+        tool = make_show_hardware_tool()
+
+        with patch('platform.architecture', return_value=("64bit", "ELF")) as arch, \
+                patch('orchestrator.tools.system._available_memory_mb', side_effect=[100, 50]):
+            first = tool.execute({})
+            second = tool.execute({})
+
+        assert arch.call_count == 1
+        assert first["memory_available_mb"] == 100
+        assert second["memory_available_mb"] == 50
+        assert second["system_info"] == first["system_info"]
+
 
 class TestShowPSTool:
     """Test the show_ps tool."""